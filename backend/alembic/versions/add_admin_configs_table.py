@@ -7,6 +7,9 @@ Create Date: 2026-02-11 10:00:00.000000
 
 from alembic import op
 import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from app.core.migrations import missing
 
 # revision identifiers, used by Alembic.
 revision = 'add_admin_configs'
@@ -16,15 +19,26 @@ depends_on = None
 
 
 def upgrade():
+    if not missing("table", "admin_configs"):
+        return
+    bind = op.get_bind()
+    is_postgres = bind.dialect.name == "postgresql"
+    config_data_type = postgresql.JSONB(astext_type=sa.Text()) if is_postgres else sa.JSON()
     op.create_table(
         'admin_configs',
         sa.Column('id', sa.String(), primary_key=True),
         sa.Column('key', sa.String(), nullable=False, unique=True, index=True),
         sa.Column('value', sa.Text(), nullable=True),
-        sa.Column('config_data', sa.JSON(), nullable=True),
+        sa.Column('config_data', config_data_type, nullable=True),
         sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now()),
         sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
     )
+    if is_postgres:
+        # Key/containment lookups on config_data become index scans
+        op.execute(
+            "CREATE INDEX IF NOT EXISTS ix_admin_configs_config_data "
+            "ON admin_configs USING GIN (config_data jsonb_path_ops)"
+        )
 
 
 def downgrade():
@@ -7,6 +7,8 @@ Create Date: 2026-02-04
 from alembic import op
 import sqlalchemy as sa
 
+from app.core.migrations import missing
+
 # revision identifiers, used by Alembic.
 revision = 'add_cluster_id_to_environments'
 down_revision = 'add_envtype_to_clusters'
@@ -18,32 +20,58 @@ def upgrade():
     bind = op.get_bind()
     dialect = bind.dialect.name
     # Add nullable column and FK (SET NULL on delete)
-    op.add_column('environments', sa.Column('cluster_id', sa.String(), nullable=True))
-    try:
-        op.create_foreign_key(
-            'fk_environments_cluster',
-            'environments',
-            'kubernetes_clusters',
-            ['cluster_id'],
-            ['id'],
-            ondelete='SET NULL',
-        )
-    except Exception:
-        pass
-    try:
-        op.create_index('ix_environments_cluster_id', 'environments', ['cluster_id'])
-    except Exception:
-        pass
+    if missing("column", "environments.cluster_id", bind):
+        op.add_column('environments', sa.Column('cluster_id', sa.String(), nullable=True))
+    if dialect == "postgresql":
+        # On a populated table add the FK as NOT VALID (no scan under the strong lock) and
+        # validate it after the migration transaction commits; empty tables validate for free.
+        has_rows = bool(bind.execute(sa.text("SELECT EXISTS (SELECT 1 FROM environments)")).scalar())
+        not_valid = " NOT VALID" if has_rows else ""
+        # Swallow an existing constraint server-side instead of round-tripping a Python exception
+        op.execute(f"""
+            DO $$ BEGIN
+                ALTER TABLE environments
+                    ADD CONSTRAINT fk_environments_cluster
+                    FOREIGN KEY (cluster_id) REFERENCES kubernetes_clusters (id) ON DELETE SET NULL{not_valid};
+            EXCEPTION WHEN duplicate_object THEN NULL;
+            END $$;
+        """)
+        # Validate the FK and build the index outside the migration transaction so neither
+        # blocks writes; CONCURRENTLY cannot run inside a transaction anyway
+        with op.get_context().autocommit_block():
+            if has_rows:
+                # Only takes SHARE UPDATE EXCLUSIVE, so reads and writes continue
+                op.execute("ALTER TABLE environments VALIDATE CONSTRAINT fk_environments_cluster")
+            op.execute(
+                "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_environments_cluster_id "
+                "ON environments (cluster_id)"
+            )
+    else:
+        inspector = sa.inspect(bind)
+        # SQLite cannot add constraints outside batch mode; skip instead of catching the failure
+        if dialect != "sqlite" and 'fk_environments_cluster' not in {fk['name'] for fk in inspector.get_foreign_keys('environments')}:
+            op.create_foreign_key(
+                'fk_environments_cluster',
+                'environments',
+                'kubernetes_clusters',
+                ['cluster_id'],
+                ['id'],
+                ondelete='SET NULL',
+            )
+        if 'ix_environments_cluster_id' not in {ix['name'] for ix in inspector.get_indexes('environments')}:
+            op.create_index('ix_environments_cluster_id', 'environments', ['cluster_id'])
 
 
 def downgrade():
-    try:
-        op.drop_index('ix_environments_cluster_id', table_name='environments')
-    except Exception:
-        pass
-    try:
-        op.drop_constraint('fk_environments_cluster', 'environments', type_='foreignkey')
-    except Exception:
-        pass
+    bind = op.get_bind()
+    dialect = bind.dialect.name
+    if dialect == "postgresql":
+        op.execute("DROP INDEX IF EXISTS ix_environments_cluster_id")
+        op.execute("ALTER TABLE environments DROP CONSTRAINT IF EXISTS fk_environments_cluster")
+    else:
+        inspector = sa.inspect(bind)
+        if 'ix_environments_cluster_id' in {ix['name'] for ix in inspector.get_indexes('environments')}:
+            op.drop_index('ix_environments_cluster_id', table_name='environments')
+        if dialect != "sqlite" and 'fk_environments_cluster' in {fk['name'] for fk in inspector.get_foreign_keys('environments')}:
+            op.drop_constraint('fk_environments_cluster', 'environments', type_='foreignkey')
     op.drop_column('environments', 'cluster_id')
-
@@ -7,7 +7,8 @@ Create Date: 2026-01-27 00:00:00.000000
 """
 from alembic import op
 import sqlalchemy as sa
-from sqlalchemy import text
+
+from app.core.migrations import table_exists
 
 # revision identifiers, used by Alembic.
 revision = 'add_deploy_queue_events'
@@ -16,62 +17,82 @@ branch_labels = None
 depends_on = None
 
 
-def table_exists(conn, table_name: str) -> bool:
-    result = conn.execute(text(
-        "SELECT EXISTS (SELECT 1 FROM information_schema.tables WHERE table_name = :t)"
-    ), {"t": table_name})
-    return bool(result.scalar())
+def create_indexes(conn, table_name: str, indexes: dict) -> None:
+    if conn.dialect.name == "postgresql":
+        # All of a table's indexes in one round-trip; asyncpg prepares every execute, so a
+        # semicolon-separated script has to travel as a single DO block
+        statements = "\n".join(
+            f"CREATE INDEX IF NOT EXISTS {name} ON {table_name} ({', '.join(columns)});"
+            for name, columns in indexes.items()
+        )
+        op.execute(f"DO $$ BEGIN\n{statements}\nEND $$;")
+        return
+    for name, columns in indexes.items():
+        op.create_index(name, table_name, columns)
 
 
 def upgrade() -> None:
     conn = op.get_bind()
+    # Generate ids server-side so callers can bulk INSERT without binding one per row
+    uuid_default = sa.text("gen_random_uuid()::text") if conn.dialect.name == "postgresql" else None
+    try:
+        if not table_exists(id(conn), 'deployment_queue'):
+            op.create_table(
+                'deployment_queue',
+                sa.Column('id', sa.String(), primary_key=True, nullable=False, server_default=uuid_default),
+                sa.Column('service_id', sa.String(), sa.ForeignKey('services.id', ondelete='CASCADE'), nullable=False, index=True),
+                sa.Column('requested_version_label', sa.String(), nullable=False),
+                sa.Column('status', sa.String(), nullable=False, server_default=sa.text("'pending'")),
+                sa.Column('locked_by', sa.String(), nullable=True),
+                sa.Column('locked_at', sa.DateTime(timezone=True), nullable=True),
+                sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+                sa.Column('started_at', sa.DateTime(timezone=True), nullable=True),
+                sa.Column('completed_at', sa.DateTime(timezone=True), nullable=True),
+            )
+            create_indexes(conn, 'deployment_queue', {
+                'ix_deployment_queue_service_id': ['service_id'],
+                'ix_deployment_queue_status': ['status'],
+                'ix_deployment_queue_locked_by': ['locked_by'],
+            })
 
-    if not table_exists(conn, 'deployment_queue'):
-        op.create_table(
-            'deployment_queue',
-            sa.Column('id', sa.String(), primary_key=True, nullable=False),
-            sa.Column('service_id', sa.String(), sa.ForeignKey('services.id', ondelete='CASCADE'), nullable=False, index=True),
-            sa.Column('requested_version_label', sa.String(), nullable=False),
-            sa.Column('status', sa.String(), nullable=False, server_default=sa.text("'pending'")),
-            sa.Column('locked_by', sa.String(), nullable=True),
-            sa.Column('locked_at', sa.DateTime(timezone=True), nullable=True),
-            sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
-            sa.Column('started_at', sa.DateTime(timezone=True), nullable=True),
-            sa.Column('completed_at', sa.DateTime(timezone=True), nullable=True),
-        )
-        op.create_index('ix_deployment_queue_service_id', 'deployment_queue', ['service_id'])
-        op.create_index('ix_deployment_queue_status', 'deployment_queue', ['status'])
-        op.create_index('ix_deployment_queue_locked_by', 'deployment_queue', ['locked_by'])
-
-    if not table_exists(conn, 'deployment_step_checkpoints'):
-        op.create_table(
-            'deployment_step_checkpoints',
-            sa.Column('id', sa.String(), primary_key=True, nullable=False),
-            sa.Column('deployment_id', sa.String(), sa.ForeignKey('deployments.id', ondelete='CASCADE'), nullable=False, index=True),
-            sa.Column('step_name', sa.String(), nullable=False),
-            sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
-            sa.UniqueConstraint('deployment_id', 'step_name', name='uq_deployment_step_unique'),
-        )
-        op.create_index('ix_deployment_step_ck_deployment_id', 'deployment_step_checkpoints', ['deployment_id'])
+        if not table_exists(id(conn), 'deployment_step_checkpoints'):
+            op.create_table(
+                'deployment_step_checkpoints',
+                sa.Column('id', sa.String(), primary_key=True, nullable=False, server_default=uuid_default),
+                sa.Column('deployment_id', sa.String(), sa.ForeignKey('deployments.id', ondelete='CASCADE'), nullable=False, index=True),
+                sa.Column('step_name', sa.String(), nullable=False),
+                sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+                sa.UniqueConstraint('deployment_id', 'step_name', name='uq_deployment_step_unique'),
+            )
+            create_indexes(conn, 'deployment_step_checkpoints', {
+                'ix_deployment_step_ck_deployment_id': ['deployment_id'],
+            })
 
-    if not table_exists(conn, 'deployment_events'):
-        op.create_table(
-            'deployment_events',
-            sa.Column('id', sa.String(), primary_key=True, nullable=False),
-            sa.Column('deployment_id', sa.String(), sa.ForeignKey('deployments.id', ondelete='CASCADE'), nullable=False, index=True),
-            sa.Column('event_type', sa.String(), nullable=False),
-            sa.Column('message', sa.String(), nullable=True),
-            sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
-        )
-        op.create_index('ix_deployment_events_deployment_id', 'deployment_events', ['deployment_id'])
+        if not table_exists(id(conn), 'deployment_events'):
+            op.create_table(
+                'deployment_events',
+                sa.Column('id', sa.String(), primary_key=True, nullable=False, server_default=uuid_default),
+                sa.Column('deployment_id', sa.String(), sa.ForeignKey('deployments.id', ondelete='CASCADE'), nullable=False, index=True),
+                sa.Column('event_type', sa.String(), nullable=False),
+                sa.Column('message', sa.String(), nullable=True),
+                sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+            )
+            create_indexes(conn, 'deployment_events', {
+                'ix_deployment_events_deployment_id': ['deployment_id'],
+            })
+    finally:
+        table_exists.cache_clear()
 
 
 def downgrade() -> None:
     conn = op.get_bind()
-    if table_exists(conn, 'deployment_events'):
-        op.drop_table('deployment_events')
-    if table_exists(conn, 'deployment_step_checkpoints'):
-        op.drop_table('deployment_step_checkpoints')
-    if table_exists(conn, 'deployment_queue'):
-        op.drop_table('deployment_queue')
+    try:
+        if table_exists(id(conn), 'deployment_events'):
+            op.drop_table('deployment_events')
+        if table_exists(id(conn), 'deployment_step_checkpoints'):
+            op.drop_table('deployment_step_checkpoints')
+        if table_exists(id(conn), 'deployment_queue'):
+            op.drop_table('deployment_queue')
+    finally:
+        table_exists.cache_clear()
 
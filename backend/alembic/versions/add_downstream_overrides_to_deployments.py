@@ -8,6 +8,8 @@ Create Date: 2026-02-12 10:00:00.000000
 from alembic import op
 import sqlalchemy as sa
 
+from app.core.migrations import missing
+
 revision = 'add_ds_overrides'
 down_revision = 'add_admin_configs'
 branch_labels = None
@@ -15,6 +17,13 @@ depends_on = None
 
 
 def upgrade():
+    bind = op.get_bind()
+    if bind.dialect.name == "postgresql":
+        # No-op when add_env_id_to_deployments already added the column
+        op.execute("ALTER TABLE deployments ADD COLUMN IF NOT EXISTS downstream_overrides jsonb")
+        return
+    if not missing("column", "deployments.downstream_overrides"):
+        return
     op.add_column('deployments', sa.Column('downstream_overrides', sa.JSON(), nullable=True))
 
 
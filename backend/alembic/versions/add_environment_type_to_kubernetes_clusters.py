@@ -4,9 +4,10 @@ Revision ID: add_envtype_to_clusters
 Revises: add_kubernetes_clusters
 Create Date: 2026-02-04
 """
+import functools
+
 from alembic import op
 import sqlalchemy as sa
-from sqlalchemy.engine.reflection import Inspector
 from sqlalchemy.dialects import postgresql
 
 # revision identifiers, used by Alembic.
@@ -16,39 +17,68 @@ branch_labels = None
 depends_on = None
 
 
+@functools.lru_cache(maxsize=None)
+def _inspector(bind) -> sa.Inspector:
+    # One Inspector per bind; its info_cache memoizes reflection across calls
+    return sa.inspect(bind)
+
+
+@functools.lru_cache(maxsize=None)
+def _column_names(bind, table_name: str) -> frozenset:
+    return frozenset(col['name'] for col in _inspector(bind).get_columns(table_name))
+
+
 def _has_column(table_name: str, column_name: str) -> bool:
-    bind = op.get_bind()
-    inspector = Inspector.from_engine(bind)  # type: ignore
-    cols = [col['name'] for col in inspector.get_columns(table_name)]
-    return column_name in cols
+    return column_name in _column_names(op.get_bind(), table_name)
+
+
+def _has_index(table_name: str, index_name: str) -> bool:
+    return any(ix['name'] == index_name for ix in _inspector(op.get_bind()).get_indexes(table_name))
+
+
+def _clear_reflection_cache() -> None:
+    _column_names.cache_clear()
+    _inspector.cache_clear()
 
 
 def upgrade():
     # Use existing PostgreSQL ENUM type 'environmenttype' when available
     bind = op.get_bind()
     is_postgres = bind.dialect.name == "postgresql"
-    if not _has_column('kubernetes_clusters', 'environment_type'):
-        if is_postgres:
-            env_enum = postgresql.ENUM(
-                'development', 'testing', 'staging', 'production', 'sandbox', 'dev', 'prod',
-                name='environmenttype',
-                create_type=False,
-            )
-            op.add_column('kubernetes_clusters', sa.Column('environment_type', env_enum, nullable=True))
-        else:
-            op.add_column('kubernetes_clusters', sa.Column('environment_type', sa.String(), nullable=True))
-        # Optional index for filtering by env type
-        try:
-            op.create_index('ix_kubernetes_clusters_environment_type', 'kubernetes_clusters', ['environment_type'])
-        except Exception:
-            pass
+    try:
+        if not _has_column('kubernetes_clusters', 'environment_type'):
+            if is_postgres:
+                env_enum = postgresql.ENUM(
+                    'development', 'testing', 'staging', 'production', 'sandbox', 'dev', 'prod',
+                    name='environmenttype',
+                    create_type=False,
+                )
+                op.add_column('kubernetes_clusters', sa.Column('environment_type', env_enum, nullable=True))
+            else:
+                op.add_column('kubernetes_clusters', sa.Column('environment_type', sa.String(), nullable=True))
+            # Optional index for filtering by env type
+            if is_postgres:
+                op.execute(
+                    "CREATE INDEX IF NOT EXISTS ix_kubernetes_clusters_environment_type "
+                    "ON kubernetes_clusters (environment_type)"
+                )
+            else:
+                if not _has_index('kubernetes_clusters', 'ix_kubernetes_clusters_environment_type'):
+                    op.create_index('ix_kubernetes_clusters_environment_type', 'kubernetes_clusters', ['environment_type'])
+    finally:
+        _clear_reflection_cache()
 
 
 def downgrade():
-    if _has_column('kubernetes_clusters', 'environment_type'):
-        try:
-            op.drop_index('ix_kubernetes_clusters_environment_type', table_name='kubernetes_clusters')
-        except Exception:
-            pass
-        op.drop_column('kubernetes_clusters', 'environment_type')
-
+    bind = op.get_bind()
+    is_postgres = bind.dialect.name == "postgresql"
+    try:
+        if _has_column('kubernetes_clusters', 'environment_type'):
+            if is_postgres:
+                op.execute("DROP INDEX IF EXISTS ix_kubernetes_clusters_environment_type")
+            else:
+                if _has_index('kubernetes_clusters', 'ix_kubernetes_clusters_environment_type'):
+                    op.drop_index('ix_kubernetes_clusters_environment_type', table_name='kubernetes_clusters')
+            op.drop_column('kubernetes_clusters', 'environment_type')
+    finally:
+        _clear_reflection_cache()
@@ -15,19 +15,30 @@ depends_on = None
 
 
 def upgrade():
-    try:
+    bind = op.get_bind()
+    if bind.dialect.name == "postgresql":
+        # Build the index without blocking writes; CONCURRENTLY cannot run inside a transaction
+        with op.get_context().autocommit_block():
+            op.execute(
+                "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_deployments_service_created_at "
+                "ON deployments (service_id, created_at)"
+            )
+        return
+    inspector = sa.inspect(bind)
+    if 'ix_deployments_service_created_at' not in {ix['name'] for ix in inspector.get_indexes('deployments')}:
         op.create_index(
             'ix_deployments_service_created_at',
             'deployments',
             ['service_id', 'created_at'],
         )
-    except Exception:
-        pass
 
 
 def downgrade():
-    try:
+    bind = op.get_bind()
+    if bind.dialect.name == "postgresql":
+        op.execute("DROP INDEX IF EXISTS ix_deployments_service_created_at")
+        return
+    inspector = sa.inspect(bind)
+    if 'ix_deployments_service_created_at' in {ix['name'] for ix in inspector.get_indexes('deployments')}:
         op.drop_index('ix_deployments_service_created_at', table_name='deployments')
-    except Exception:
-        pass
 
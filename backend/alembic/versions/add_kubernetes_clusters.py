@@ -8,6 +8,8 @@ from alembic import op
 import sqlalchemy as sa
 from sqlalchemy.dialects import postgresql
 
+from app.core.migrations import missing
+
 # revision identifiers, used by Alembic.
 revision = 'add_kubernetes_clusters'
 down_revision = 'add_svc_versions_deploy'
@@ -23,8 +25,7 @@ def upgrade() -> None:
         create_type=False,  # don't attempt to CREATE TYPE if it exists
     )
     bind = op.get_bind()
-    inspector = sa.inspect(bind)
-    if not inspector.has_table('kubernetes_clusters'):
+    if missing("table", "kubernetes_clusters", bind):
         op.create_table(
             'kubernetes_clusters',
             sa.Column('id', sa.String(), primary_key=True),
@@ -40,8 +41,18 @@ def upgrade() -> None:
             sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('NOW()')),
             sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
         )
-        op.create_index('ix_kubernetes_clusters_name', 'kubernetes_clusters', ['name'])
-        op.create_index('ix_kubernetes_clusters_auth_method', 'kubernetes_clusters', ['auth_method'])
+        if bind.dialect.name == "postgresql":
+            # Both indexes in one round-trip; asyncpg prepares every execute, so a
+            # semicolon-separated script has to travel as a single DO block
+            op.execute("""
+                DO $$ BEGIN
+                    CREATE INDEX IF NOT EXISTS ix_kubernetes_clusters_name ON kubernetes_clusters (name);
+                    CREATE INDEX IF NOT EXISTS ix_kubernetes_clusters_auth_method ON kubernetes_clusters (auth_method);
+                END $$;
+            """)
+        else:
+            op.create_index('ix_kubernetes_clusters_name', 'kubernetes_clusters', ['name'])
+            op.create_index('ix_kubernetes_clusters_auth_method', 'kubernetes_clusters', ['auth_method'])
 
 
 def downgrade() -> None:
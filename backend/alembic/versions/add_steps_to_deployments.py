@@ -8,6 +8,8 @@ Create Date: 2026-02-10 10:00:00.000000
 from alembic import op
 import sqlalchemy as sa
 
+from app.core.migrations import missing
+
 # revision identifiers, used by Alembic.
 revision = 'add_steps_to_deploy'
 down_revision = '481b7672b9f5'
@@ -16,6 +18,13 @@ depends_on = None
 
 
 def upgrade():
+    bind = op.get_bind()
+    if bind.dialect.name == "postgresql":
+        # No-op when add_env_id_to_deployments already added the column
+        op.execute("ALTER TABLE deployments ADD COLUMN IF NOT EXISTS steps jsonb")
+        return
+    if not missing("column", "deployments.steps"):
+        return
     with op.batch_alter_table('deployments') as batch_op:
         batch_op.add_column(sa.Column('steps', sa.JSON(), nullable=True))
 
@@ -8,6 +8,8 @@ Create Date: 2026-02-09 12:15:00.000000
 from alembic import op
 import sqlalchemy as sa
 
+from app.core.migrations import missing
+
 # revision identifiers, used by Alembic.
 revision = 'add_workshop_uuid_deploy'
 down_revision = 'add_idx_dep_svc_created_at'
@@ -17,6 +19,18 @@ depends_on = None
 
 def upgrade():
     # add nullable workflow_uuid column with index
+    bind = op.get_bind()
+    if bind.dialect.name == "postgresql":
+        op.execute("ALTER TABLE deployments ADD COLUMN IF NOT EXISTS workflow_uuid varchar")
+        # Build the index without blocking writes; CONCURRENTLY cannot run inside a transaction
+        with op.get_context().autocommit_block():
+            op.execute(
+                "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_deployments_workflow_uuid "
+                "ON deployments (workflow_uuid)"
+            )
+        return
+    if not missing("column", "deployments.workflow_uuid"):
+        return
     with op.batch_alter_table('deployments') as batch_op:
         batch_op.add_column(sa.Column('workflow_uuid', sa.String(), nullable=True))
         batch_op.create_index('ix_deployments_workflow_uuid', ['workflow_uuid'], unique=False)
@@ -8,6 +8,8 @@ Create Date: 2026-02-13 10:00:00.000000
 from alembic import op
 import sqlalchemy as sa
 
+from app.core.migrations import missing
+
 revision = 'add_wf_uuid_env_cfg'
 down_revision = 'add_ds_overrides'
 branch_labels = None
@@ -15,6 +17,19 @@ depends_on = None
 
 
 def upgrade():
+    bind = op.get_bind()
+    if bind.dialect.name == "postgresql":
+        if missing("column", "environment_configs.workflow_uuid", bind):
+            op.add_column('environment_configs', sa.Column('workflow_uuid', sa.String(), nullable=True))
+        # Build the index without blocking writes; CONCURRENTLY cannot run inside a transaction
+        with op.get_context().autocommit_block():
+            op.execute(
+                "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_environment_configs_workflow_uuid "
+                "ON environment_configs (workflow_uuid)"
+            )
+        return
+    if not missing("column", "environment_configs.workflow_uuid", bind):
+        return
     with op.batch_alter_table('environment_configs') as batch_op:
         batch_op.add_column(sa.Column('workflow_uuid', sa.String(), nullable=True))
         batch_op.create_index('ix_environment_configs_workflow_uuid', ['workflow_uuid'], unique=False)
@@ -0,0 +1,50 @@
+"""make deployments(service_id, created_at) index covering
+
+Revision ID: cover_idx_dep_svc_created
+Revises: uuid_deployments_id
+Create Date: 2026-10-16 12:00:00.000000
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'cover_idx_dep_svc_created'
+down_revision = 'uuid_deployments_id'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    bind = op.get_bind()
+    if bind.dialect.name != "postgresql":
+        return
+    # "Latest deployments for a service" reads forward in created_at DESC order and gets
+    # status/workflow_uuid from the index itself (index-only scan, no heap fetch).
+    # Build the replacement online, then swap it in under the original name.
+    with op.get_context().autocommit_block():
+        op.execute(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_deployments_service_created_at_cov "
+            "ON deployments (service_id, created_at DESC) INCLUDE (status, workflow_uuid)"
+        )
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_deployments_service_created_at")
+        op.execute(
+            "ALTER INDEX ix_deployments_service_created_at_cov "
+            "RENAME TO ix_deployments_service_created_at"
+        )
+
+
+def downgrade():
+    bind = op.get_bind()
+    if bind.dialect.name != "postgresql":
+        return
+    with op.get_context().autocommit_block():
+        op.execute(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_deployments_service_created_at_plain "
+            "ON deployments (service_id, created_at)"
+        )
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_deployments_service_created_at")
+        op.execute(
+            "ALTER INDEX ix_deployments_service_created_at_plain "
+            "RENAME TO ix_deployments_service_created_at"
+        )
@@ -6,7 +6,8 @@ Create Date: 2026-01-27 00:30:00.000000
 
 """
 from alembic import op
-from sqlalchemy import text
+
+from app.core.migrations import table_exists
 
 # revision identifiers, used by Alembic.
 revision = 'drop_deploy_queue_events'
@@ -15,19 +16,15 @@ branch_labels = None
 depends_on = None
 
 
-def table_exists(conn, table_name: str) -> bool:
-    result = conn.execute(text(
-        "SELECT EXISTS (SELECT 1 FROM information_schema.tables WHERE table_name = :t)"
-    ), {"t": table_name})
-    return bool(result.scalar())
-
-
 def upgrade() -> None:
     conn = op.get_bind()
-    # Drop custom tables if present
-    for t in ('deployment_events', 'deployment_step_checkpoints', 'deployment_queue'):
-        if table_exists(conn, t):
-            op.drop_table(t)
+    try:
+        # Drop custom tables if present
+        for t in ('deployment_events', 'deployment_step_checkpoints', 'deployment_queue'):
+            if table_exists(id(conn), t):
+                op.drop_table(t)
+    finally:
+        table_exists.cache_clear()
 
 
 def downgrade() -> None:
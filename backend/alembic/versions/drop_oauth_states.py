@@ -0,0 +1,36 @@
+"""drop oauth_states; OAuth state is now a signed token
+
+Revision ID: drop_oauth_states
+Revises: drop_oauth_state_idx
+Create Date: 2026-10-16 14:00:00.000000
+"""
+
+from alembic import op
+import sqlalchemy as sa
+from app.core.migrations import missing
+
+# revision identifiers, used by Alembic.
+revision = 'drop_oauth_states'
+down_revision = 'drop_oauth_state_idx'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Pending logins started before the deploy fail state verification and simply retry.
+    if missing("table", "oauth_states"):
+        return
+    op.drop_index('ix_oauth_states_created_at', table_name='oauth_states', if_exists=True)
+    op.drop_table('oauth_states')
+
+
+def downgrade():
+    if not missing("table", "oauth_states"):
+        return
+    op.create_table('oauth_states',
+    sa.Column('state', sa.String(), nullable=False),
+    sa.Column('redirect_uri', sa.Text(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.PrimaryKeyConstraint('state')
+    )
+    op.create_index('ix_oauth_states_created_at', 'oauth_states', ['created_at'], unique=False)
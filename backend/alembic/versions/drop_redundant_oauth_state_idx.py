@@ -0,0 +1,41 @@
+"""drop ix_oauth_states_state, which duplicates the primary key
+
+Revision ID: drop_oauth_state_idx
+Revises: cover_idx_dep_svc_created
+Create Date: 2026-10-16 13:00:00.000000
+"""
+
+from alembic import op
+import sqlalchemy as sa
+from app.core.migrations import missing
+
+# revision identifiers, used by Alembic.
+revision = 'drop_oauth_state_idx'
+down_revision = 'cover_idx_dep_svc_created'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # oauth_states_pkey already serves "WHERE state = :s"; the extra btree only adds
+    # write cost to every login. ix_oauth_states_created_at stays for the expiry purge.
+    if missing("index", "ix_oauth_states_state"):
+        return
+    if op.get_bind().dialect.name == "postgresql":
+        with op.get_context().autocommit_block():
+            op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_oauth_states_state")
+    else:
+        op.drop_index('ix_oauth_states_state', table_name='oauth_states')
+
+
+def downgrade():
+    if not missing("index", "ix_oauth_states_state"):
+        return
+    if op.get_bind().dialect.name == "postgresql":
+        with op.get_context().autocommit_block():
+            op.execute(
+                "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_oauth_states_state "
+                "ON oauth_states (state)"
+            )
+    else:
+        op.create_index('ix_oauth_states_state', 'oauth_states', ['state'], unique=False)
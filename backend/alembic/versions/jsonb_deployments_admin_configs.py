@@ -0,0 +1,78 @@
+"""convert deployments/admin_configs JSON columns to JSONB
+
+Revision ID: jsonb_deploy_admin_cfg
+Revises: add_wf_uuid_env_cfg
+Create Date: 2026-10-16 10:00:00.000000
+"""
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy import text
+
+# revision identifiers, used by Alembic.
+revision = 'jsonb_deploy_admin_cfg'
+down_revision = 'add_wf_uuid_env_cfg'
+branch_labels = None
+depends_on = None
+
+
+JSON_COLUMNS = {
+    'deployments': ('steps', 'downstream_overrides'),
+    'admin_configs': ('config_data',),
+}
+
+
+def _columns_of_type(conn, table_name: str, columns: tuple, type_name: str) -> list:
+    result = conn.execute(text("""
+        SELECT attname FROM pg_attribute
+        WHERE attrelid = to_regclass(:qualname)
+        AND attname = ANY(:cols)
+        AND atttypid = to_regtype(:type_name)
+        AND NOT attisdropped
+    """), {"qualname": f"public.{table_name}", "cols": list(columns), "type_name": type_name})
+    found = set(result.scalars().all())
+    return [c for c in columns if c in found]
+
+
+def _alter_types(conn, from_type: str, to_type: str) -> None:
+    for table_name, columns in JSON_COLUMNS.items():
+        pending = _columns_of_type(conn, table_name, columns, from_type)
+        if pending:
+            # One ALTER per table so it is rewritten once for all of its columns
+            clauses = ", ".join(f"ALTER COLUMN {c} TYPE {to_type} USING {c}::{to_type}" for c in pending)
+            op.execute(f"ALTER TABLE {table_name} {clauses}")
+
+
+def upgrade():
+    bind = op.get_bind()
+    if bind.dialect.name != "postgresql":
+        return
+    _alter_types(bind, 'json', 'jsonb')
+    if bind.dialect.server_version_info >= (14,):
+        # LZ4 is the cheaper TOAST codec for the large step/override documents
+        op.execute("""
+            DO $$ BEGIN
+                ALTER TABLE deployments
+                    ALTER COLUMN steps SET COMPRESSION lz4,
+                    ALTER COLUMN downstream_overrides SET COMPRESSION lz4;
+            EXCEPTION WHEN feature_not_supported THEN NULL;
+            END $$;
+        """)
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS ix_admin_configs_config_data "
+        "ON admin_configs USING GIN (config_data jsonb_path_ops)"
+    )
+
+
+def downgrade():
+    bind = op.get_bind()
+    if bind.dialect.name != "postgresql":
+        return
+    op.execute("DROP INDEX IF EXISTS ix_admin_configs_config_data")
+    if bind.dialect.server_version_info >= (14,):
+        op.execute(
+            "ALTER TABLE deployments "
+            "ALTER COLUMN steps SET COMPRESSION default, "
+            "ALTER COLUMN downstream_overrides SET COMPRESSION default"
+        )
+    _alter_types(bind, 'jsonb', 'json')
@@ -5,183 +5,150 @@ Revises: add_description_to_service
 Create Date: 2026-01-16 12:00:00.000000
 
 """
+import logging
+
 from alembic import op
 import sqlalchemy as sa
 from sqlalchemy import text
 
+from app.core.migrations import missing
+
 # revision identifiers, used by Alembic.
 revision = 'move_repo_runtime_config'
 down_revision = 'add_description_to_service'
 branch_labels = None
 depends_on = None
 
+logger = logging.getLogger("alembic.runtime.migration")
+
+
+def probe_schema(conn) -> tuple:
+    """Return (service_configs exists, services.repo exists, services.runtime exists)."""
+    if conn.dialect.name != "postgresql":
+        return (
+            not missing("table", "service_configs", conn),
+            not missing("column", "services.repo", conn),
+            not missing("column", "services.runtime", conn),
+        )
+    # All three catalog probes in a single round-trip
+    row = conn.execute(text("""
+        SELECT
+            to_regclass('public.service_configs') IS NOT NULL AS sc_exists,
+            EXISTS (
+                SELECT 1 FROM pg_attribute
+                WHERE attrelid = to_regclass('public.services')
+                AND attname = 'repo' AND NOT attisdropped
+            ) AS has_repo,
+            EXISTS (
+                SELECT 1 FROM pg_attribute
+                WHERE attrelid = to_regclass('public.services')
+                AND attname = 'runtime' AND NOT attisdropped
+            ) AS has_runtime
+    """)).one()
+    return bool(row.sc_exists), bool(row.has_repo), bool(row.has_runtime)
+
 
 def upgrade() -> None:
-    # Check if service_configs table exists
+    # Check if service_configs table and the repo/runtime columns exist
     conn = op.get_bind()
-    result = conn.execute(text("SELECT EXISTS (SELECT 1 FROM information_schema.tables WHERE table_name = 'service_configs')"))
-    service_configs_exists = result.scalar()
+    service_configs_exists, has_repo, has_runtime = probe_schema(conn)
     
     if not service_configs_exists:
         # If service_configs table doesn't exist, we can't migrate
         # This migration assumes service_configs table already exists
-        print("Warning: service_configs table does not exist. Skipping data migration.")
+        logger.warning("service_configs table does not exist. Skipping data migration.")
         return
     
-    # Check if services table has repo and runtime columns
-    result = conn.execute(text("""
-        SELECT EXISTS (
-            SELECT 1 FROM information_schema.columns 
-            WHERE table_name = 'services' AND column_name = 'repo'
-        )
-    """))
-    has_repo = result.scalar()
-    
-    result = conn.execute(text("""
-        SELECT EXISTS (
-            SELECT 1 FROM information_schema.columns 
-            WHERE table_name = 'services' AND column_name = 'runtime'
-        )
-    """))
-    has_runtime = result.scalar()
-    
     if not has_repo and not has_runtime:
         # Columns already removed, skip migration
-        print("Info: repo and runtime columns already removed. Skipping migration.")
+        logger.info("repo and runtime columns already removed. Skipping migration.")
         return
     
-    # Migrate existing repo values to ServiceConfig
-    if has_repo:
-        conn.execute(text("""
-            INSERT INTO service_configs (id, service_id, key, value, created_at, updated_at, deleted_at)
-            SELECT 
-                gen_random_uuid()::text,
-                id,
-                'repo',
-                repo,
-                created_at,
-                updated_at,
-                NULL
-            FROM services
-            WHERE repo IS NOT NULL 
-            AND repo != ''
-            AND deleted_at IS NULL
-            AND NOT EXISTS (
-                SELECT 1 FROM service_configs 
-                WHERE service_id = services.id 
-                AND key = 'repo'
-                AND deleted_at IS NULL
-            )
-        """))
-        print("Migrated repo values to ServiceConfig")
-    
-    # Migrate existing runtime values to ServiceConfig
-    if has_runtime:
-        conn.execute(text("""
-            INSERT INTO service_configs (id, service_id, key, value, created_at, updated_at, deleted_at)
-            SELECT 
-                gen_random_uuid()::text,
-                id,
-                'runtime',
-                runtime,
-                created_at,
-                updated_at,
-                NULL
+    # Migrate existing repo and runtime values to ServiceConfig in one pass over services,
+    # using an anti-join instead of a correlated NOT EXISTS per row. A column that is
+    # already gone is projected as NULL so its branch contributes no rows.
+    # Ids stay in the dashed text form the ORM writes (str(uuid4())); gen_random_uuid()
+    # sits in the outer SELECT so it only runs for rows that survive the anti-join.
+    repo_col = "repo" if has_repo else "NULL::varchar"
+    runtime_col = "runtime" if has_runtime else "NULL::varchar"
+    result = conn.execute(text(f"""
+        WITH src AS (
+            SELECT id, created_at, updated_at, {repo_col} AS repo, {runtime_col} AS runtime
             FROM services
-            WHERE runtime IS NOT NULL 
-            AND runtime != ''
-            AND deleted_at IS NULL
-            AND NOT EXISTS (
-                SELECT 1 FROM service_configs 
-                WHERE service_id = services.id 
-                AND key = 'runtime'
-                AND deleted_at IS NULL
-            )
-        """))
-        print("Migrated runtime values to ServiceConfig")
+            WHERE deleted_at IS NULL
+        ),
+        candidates AS (
+            SELECT id, created_at, updated_at, 'repo' AS key, repo AS value
+            FROM src WHERE repo <> ''
+            UNION ALL
+            SELECT id, created_at, updated_at, 'runtime' AS key, runtime AS value
+            FROM src WHERE runtime <> ''
+        )
+        INSERT INTO service_configs (id, service_id, key, value, created_at, updated_at, deleted_at)
+        SELECT
+            gen_random_uuid()::text,
+            c.id,
+            c.key,
+            c.value,
+            c.created_at,
+            c.updated_at,
+            NULL
+        FROM candidates c
+        LEFT JOIN service_configs sc
+            ON sc.service_id = c.id
+            AND sc.key = c.key
+            AND sc.deleted_at IS NULL
+        WHERE sc.id IS NULL
+    """))
+    logger.info("Migrated %d repo/runtime values to ServiceConfig", result.rowcount)
     
     # Remove repo column if it exists
     if has_repo:
         op.drop_column('services', 'repo')
-        print("Dropped repo column from services table")
+        logger.info("Dropped repo column from services table")
     
     # Remove runtime column if it exists
     if has_runtime:
         op.drop_column('services', 'runtime')
-        print("Dropped runtime column from services table")
+        logger.info("Dropped runtime column from services table")
 
 
 def downgrade() -> None:
     # Add repo and runtime columns back
     conn = op.get_bind()
     
-    # Check if columns already exist
-    result = conn.execute(text("""
-        SELECT EXISTS (
-            SELECT 1 FROM information_schema.columns 
-            WHERE table_name = 'services' AND column_name = 'repo'
-        )
-    """))
-    has_repo = result.scalar()
-    
-    result = conn.execute(text("""
-        SELECT EXISTS (
-            SELECT 1 FROM information_schema.columns 
-            WHERE table_name = 'services' AND column_name = 'runtime'
-        )
-    """))
-    has_runtime = result.scalar()
+    # Check if columns and the service_configs table already exist
+    service_configs_exists, has_repo, has_runtime = probe_schema(conn)
     
     # Add repo column if it doesn't exist
     if not has_repo:
         op.add_column('services', sa.Column('repo', sa.String(), nullable=True))
-        print("Added repo column to services table")
+        logger.info("Added repo column to services table")
     
     # Add runtime column if it doesn't exist
     if not has_runtime:
         op.add_column('services', sa.Column('runtime', sa.String(), nullable=True))
-        print("Added runtime column to services table")
+        logger.info("Added runtime column to services table")
     
     # Migrate data back from ServiceConfig to services table
-    # Check if service_configs table exists
-    result = conn.execute(text("SELECT EXISTS (SELECT 1 FROM information_schema.tables WHERE table_name = 'service_configs')"))
-    service_configs_exists = result.scalar()
-    
     if service_configs_exists:
-        # Restore repo values from ServiceConfig
-        conn.execute(text("""
-            UPDATE services
-            SET repo = (
-                SELECT value FROM service_configs 
-                WHERE service_configs.service_id = services.id 
-                AND service_configs.key = 'repo'
-                AND service_configs.deleted_at IS NULL
-                LIMIT 1
-            )
-            WHERE EXISTS (
-                SELECT 1 FROM service_configs 
-                WHERE service_configs.service_id = services.id 
-                AND service_configs.key = 'repo'
-                AND service_configs.deleted_at IS NULL
-            )
-        """))
-        print("Restored repo values from ServiceConfig")
-        
-        # Restore runtime values from ServiceConfig
-        conn.execute(text("""
-            UPDATE services
-            SET runtime = (
-                SELECT value FROM service_configs 
-                WHERE service_configs.service_id = services.id 
-                AND service_configs.key = 'runtime'
-                AND service_configs.deleted_at IS NULL
-                LIMIT 1
-            )
-            WHERE EXISTS (
-                SELECT 1 FROM service_configs 
-                WHERE service_configs.service_id = services.id 
-                AND service_configs.key = 'runtime'
-                AND service_configs.deleted_at IS NULL
-            )
+        # Restore repo and runtime values from ServiceConfig with one UPDATE ... FROM.
+        # service_configs is pivoted once (newest live row per key) instead of running
+        # a correlated EXISTS plus scalar subquery per services row for each column.
+        result = conn.execute(text("""
+            UPDATE services s
+            SET repo = COALESCE(sc.repo, s.repo),
+                runtime = COALESCE(sc.runtime, s.runtime)
+            FROM (
+                SELECT
+                    service_id,
+                    (array_agg(value ORDER BY created_at DESC) FILTER (WHERE key = 'repo'))[1] AS repo,
+                    (array_agg(value ORDER BY created_at DESC) FILTER (WHERE key = 'runtime'))[1] AS runtime
+                FROM service_configs
+                WHERE key IN ('repo', 'runtime')
+                AND deleted_at IS NULL
+                GROUP BY service_id
+            ) sc
+            WHERE sc.service_id = s.id
         """))
-        print("Restored runtime values from ServiceConfig")
+        logger.info("Restored repo/runtime values for %d services from ServiceConfig", result.rowcount)
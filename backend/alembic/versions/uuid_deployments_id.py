@@ -0,0 +1,52 @@
+"""store deployments.id as native uuid
+
+Revision ID: uuid_deployments_id
+Revises: jsonb_deploy_admin_cfg
+Create Date: 2026-10-16 11:00:00.000000
+"""
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy import text
+
+# revision identifiers, used by Alembic.
+revision = 'uuid_deployments_id'
+down_revision = 'jsonb_deploy_admin_cfg'
+branch_labels = None
+depends_on = None
+
+
+UUID_PATTERN = r'^\{?[0-9a-f]{8}-?([0-9a-f]{4}-?){3}[0-9a-f]{12}\}?$'
+
+
+def _column_type(conn, table_name: str, column_name: str):
+    return conn.execute(text("""
+        SELECT format_type(atttypid, atttypmod) FROM pg_attribute
+        WHERE attrelid = to_regclass(:qualname)
+        AND attname = :col
+        AND NOT attisdropped
+    """), {"qualname": f"public.{table_name}", "col": column_name}).scalar()
+
+
+def upgrade():
+    # deployments.id is not referenced by any foreign key, so it can switch to a 16-byte
+    # uuid on its own; FK columns would need every referenced primary key converted too.
+    bind = op.get_bind()
+    if bind.dialect.name != "postgresql" or _column_type(bind, 'deployments', 'id') == 'uuid':
+        return
+    invalid = bind.execute(
+        text("SELECT count(*) FROM deployments WHERE id !~* :pattern"),
+        {"pattern": UUID_PATTERN},
+    ).scalar()
+    if invalid:
+        raise RuntimeError(
+            f"{invalid} deployments.id values are not UUIDs; fix them before converting the column"
+        )
+    op.execute("ALTER TABLE deployments ALTER COLUMN id TYPE uuid USING id::uuid")
+
+
+def downgrade():
+    bind = op.get_bind()
+    if bind.dialect.name != "postgresql" or _column_type(bind, 'deployments', 'id') != 'uuid':
+        return
+    op.execute("ALTER TABLE deployments ALTER COLUMN id TYPE varchar USING id::text")
@@ -1,38 +1,61 @@
 """
 Authentication routes - OAuth/SSO - PostgreSQL version
 """
+from __future__ import annotations
+
 from typing import Optional, Dict
-from datetime import datetime, timedelta
 from fastapi import APIRouter, Depends, HTTPException, status, Query, Response
-from fastapi.responses import RedirectResponse
-from urllib.parse import quote, urlparse, urlunparse, parse_qs
-import secrets
+from fastapi.responses import RedirectResponse, JSONResponse
+from urllib.parse import quote, urlparse
 import logging
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import Boolean, cast, exists, func, literal_column, null, or_, select, union_all
+from sqlalchemy.orm import aliased
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from app.core.database import get_db
-from app.core.dependencies import get_current_user_required
+from app.core.dependencies import get_current_user_model_required
 from app.core.oauth import (
+    create_oauth_state,
+    verify_oauth_state,
     get_oauth_authorization_url,
     exchange_code_for_token,
     get_user_info,
 )
-from app.core.security import create_access_token
+from app.core.security import create_access_token_async
 from app.core.config import settings
 from app.models.user import User
-from app.models.oauth_state import OAuthState
 from app.schemas.user import UserResponse
+try:
+    import orjson  # noqa: F401 - optional, enables ORJSONResponse
+    from fastapi.responses import ORJSONResponse as AuthJSONResponse
+except ImportError:  # pragma: no cover - orjson optional
+    AuthJSONResponse = JSONResponse
 
-router = APIRouter()
+router = APIRouter(default_response_class=AuthJSONResponse)
 logger = logging.getLogger(__name__)
 
-# OAuth state is now stored in PostgreSQL via OAuthState model
+# OAuth state is a signed token (see app.core.oauth.create_oauth_state); nothing is stored server-side
+
+# Auth cookie settings are fixed at startup:
+# - httponly: Prevents JavaScript access (XSS protection)
+# - secure: Only sent over HTTPS (set to True in production with HTTPS)
+# - samesite: CSRF protection
+# - max_age: Token expiration time in seconds
+_AUTH_COOKIE_KWARGS = dict(
+    key="access_token",
+    max_age=settings.JWT_ACCESS_TOKEN_EXPIRE_MINUTES * 60,
+    httponly=True,
+    secure=settings.COOKIE_SECURE,
+    samesite=settings.COOKIE_SAMESITE,
+    path="/",  # Available to all paths
+)
 
 
 async def sync_user_from_sso(user_info: Dict, db: AsyncSession) -> User:
     """
     Automatically create or update user from SSO provider information.
     This function is called automatically upon successful SSO authentication.
+    The upsert runs in the caller's transaction; it is not committed here.
     
     Args:
         user_info: User information dictionary from SSO provider
@@ -64,46 +87,42 @@ async def sync_user_from_sso(user_info: Dict, db: AsyncSession) -> User:
         # Fallback to email username if no name provided
         name = email.split("@")[0]
     
-    # Get existing user or create new one
-    result = await db.execute(select(User).where(User.email == email))
-    user = result.scalar_one_or_none()
-    
-    if user:
-        # Update existing user if any profile changes detected
-        updated = False
-        changes = []
-        
-        if user.name != name:
-            old_name = user.name
-            user.name = name
-            updated = True
-            changes.append(f"name: '{old_name}' -> '{name}'")
-        
-        # Ensure user remains active (unless explicitly deactivated by admin)
-        # This allows users to re-authenticate and regain access
-        if not user.is_active:
-            user.is_active = True
-            updated = True
-            changes.append("is_active: False -> True")
-        
-        if updated:
-            logger.info(f"Updating user profile for {email}: {', '.join(changes)}")
-            await db.commit()
-            await db.refresh(user)
-        else:
-            logger.debug(f"User {email} profile is up to date")
-    else:
-        # Automatically create new user upon successful SSO authentication
-        user = User(
+    # Create or update the user in a single INSERT ... ON CONFLICT (email) DO UPDATE.
+    # The WHERE clause skips the write when the profile is already up to date
+    # (no dead tuple per login); is_active is restored so users who re-authenticate
+    # regain access. xmax = 0 tells a fresh insert apart from an update.
+    upsert = (
+        pg_insert(User)
+        .values(
             email=email,
             name=name,
             is_admin=False,  # New users are not admins by default
             is_active=True,  # Active by default upon successful SSO auth
         )
-        db.add(user)
-        await db.commit()
-        await db.refresh(user)
+        .on_conflict_do_update(
+            index_elements=[User.email],
+            set_={"name": name, "is_active": True, "updated_at": func.now()},
+            where=or_(User.name.is_distinct_from(name), User.is_active.is_not(True)),
+        )
+        .returning(*User.__table__.c, literal_column("xmax = 0").label("inserted"))
+        .cte("upsert")
+    )
+    # When the upsert skipped the write it returns nothing, so fall back to the
+    # existing row within the same statement - one round-trip either way.
+    existing = select(*User.__table__.c, cast(null(), Boolean).label("inserted")).where(
+        User.email == email, ~exists(select(upsert.c.id))
+    )
+    rows = union_all(select(upsert), existing).subquery()
+    synced_user = aliased(User, rows)
+    stmt = select(synced_user, rows.c.inserted).execution_options(populate_existing=True)
+    user, inserted = (await db.execute(stmt)).one()
+    
+    if inserted is None:
+        logger.debug(f"User {email} profile is up to date")
+    elif inserted:
         logger.info(f"Created new user from SSO: {email} ({name})")
+    else:
+        logger.info(f"Updated user profile from SSO: {email} ({name})")
     
     return user
 
@@ -111,15 +130,11 @@ async def sync_user_from_sso(user_info: Dict, db: AsyncSession) -> User:
 @router.get("/login")
 async def login(
     redirect_uri: Optional[str] = Query(None, description="URI to redirect to after successful authentication"),
-    db: AsyncSession = Depends(get_db),
 ):
     """
     Initiate OAuth login flow.
     If redirect_uri is provided, user will be redirected there after authentication.
     """
-    import time
-    from urllib.parse import urlparse
-    
     # Log OAuth configuration and redirect URI for debugging
     logger.debug(f"OAuth DISCOVERY_URL: {settings.OAUTH_DISCOVERY_URL}")
     logger.debug(f"Redirect URI: {redirect_uri}")
@@ -135,7 +150,6 @@ async def login(
             try:
                 parsed = urlparse(redirect_uri)
                 if parsed.scheme in ("http", "https"):
-                    from fastapi.responses import RedirectResponse
                     # Extract frontend base URL from redirect_uri and redirect to sign-in page
                     frontend_base = f"{parsed.scheme}://{parsed.netloc}"
                     signin_url = f"{frontend_base}/auth/signin?error={quote('oauth_not_configured')}"
@@ -150,48 +164,8 @@ async def login(
             detail=error_message,
         )
     
-    # Generate unique state token
-    # secrets.token_urlsafe(32) generates a 32-byte (256-bit) random token
-    # This provides ~2^256 possible values, making collisions extremely unlikely
-    # Database PRIMARY KEY constraint enforces uniqueness at the database level
-    max_retries = 5
-    for attempt in range(max_retries):
-        state = secrets.token_urlsafe(32)
-        
-        # Check if state already exists (extremely rare but handle it)
-        existing = await db.execute(select(OAuthState).where(OAuthState.state == state))
-        if existing.scalar_one_or_none() is None:
-            # State is unique, proceed
-            break
-        else:
-            # Collision detected (extremely rare - ~1 in 2^256 chance)
-            logger.warning(f"State collision detected on attempt {attempt + 1}, generating new state...")
-            if attempt == max_retries - 1:
-                raise HTTPException(
-                    status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                    detail="Failed to generate unique OAuth state after multiple attempts",
-                )
-    
-    # Store state in database
-    # PRIMARY KEY constraint on 'state' column ensures database-level uniqueness
-    oauth_state = OAuthState(
-        state=state,
-        redirect_uri=redirect_uri,
-    )
-    try:
-        db.add(oauth_state)
-        await db.commit()
-        logger.debug(f"Stored OAuth state in database: {state[:8]}...")
-    except Exception as e:
-        # Handle database constraint violation (duplicate state)
-        await db.rollback()
-        if "unique" in str(e).lower() or "duplicate" in str(e).lower():
-            logger.error(f"Database constraint violation: duplicate state detected (this should be extremely rare)")
-            raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail="Failed to store OAuth state due to uniqueness constraint violation",
-            )
-        raise
+    # Signed state: carries the redirect URI and expiry, verified by HMAC in the callback
+    state = create_oauth_state(redirect_uri)
     
     auth_url = await get_oauth_authorization_url(state)
     logger.debug(f"Generated OAuth authorization URL: {auth_url}")
@@ -200,7 +174,6 @@ async def login(
         try:
             parsed = urlparse(redirect_uri)
             if parsed.scheme in ("http", "https"):
-                from fastapi.responses import RedirectResponse
                 return RedirectResponse(url=auth_url)
         except Exception:
             pass  # Fall through to return JSON response
@@ -215,7 +188,11 @@ async def oauth_callback(
     error: Optional[str] = Query(None),
     db: AsyncSession = Depends(get_db),
 ):
-    """OAuth callback handler"""
+    """
+    OAuth callback handler.
+    The state is verified without a database round-trip; the user sync runs in
+    the request transaction that get_db commits once the handler returns.
+    """
     logger.info(f"OAuth callback request - Error Check")
     if error:
         raise HTTPException(
@@ -230,39 +207,16 @@ async def oauth_callback(
             detail="Missing code or state parameter",
         )
     
-    # Verify state exists in database
-    result = await db.execute(select(OAuthState).where(OAuthState.state == state))
-    oauth_state = result.scalar_one_or_none()
-    
-    if not oauth_state:
-        logger.warning(f"Invalid OAuth state: {state[:8]}...")
+    # Verify the signed state and recover the redirect URI it carries
+    try:
+        redirect_uri = verify_oauth_state(state)
+    except ValueError as e:
+        logger.warning(f"Invalid OAuth state: {e}")
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Invalid state parameter",
         )
     
-    # Get redirect URI from state
-    redirect_uri = oauth_state.redirect_uri
-    
-    # Delete used state (one-time use)
-    await db.delete(oauth_state)
-    await db.commit()
-    logger.debug(f"Deleted used OAuth state: {state[:8]}...")
-    
-    # Cleanup expired states (older than 1 hour) in background
-    # This prevents the table from growing indefinitely
-    from datetime import timezone
-    expired_cutoff = datetime.now(timezone.utc) - timedelta(hours=1)
-    expired_result = await db.execute(
-        select(OAuthState).where(OAuthState.created_at < expired_cutoff)
-    )
-    expired_states = expired_result.scalars().all()
-    for expired_state in expired_states:
-        await db.delete(expired_state)
-    if expired_states:
-        await db.commit()
-        logger.debug(f"Cleaned up {len(expired_states)} expired OAuth states")
-    
     # Exchange code for token
     token_data = await exchange_code_for_token(code)
     if not token_data:
@@ -305,52 +259,27 @@ async def oauth_callback(
         )
         
     # Create JWT token for our API
-    jwt_token = create_access_token(data={"sub": user.email})
-    
-    # Convert to UserResponse
-    user_response = UserResponse.model_validate(user)
+    # Identity claims let get_current_user skip the users lookup for this token
+    jwt_token = await create_access_token_async(data={
+        "sub": user.email,
+        "uid": user.id,
+        "name": user.name,
+        "is_admin": user.is_admin,
+    })
     
     # Create response with HTTP-only cookie
     # Default redirect to GraphQL endpoint if no redirect_uri provided
     if not redirect_uri:
         redirect_uri = "/api/v1/graphql"
     
-    # Parse redirect URI to determine if it's a backend URL
-    parsed = urlparse(redirect_uri)
-    is_backend_url = (
-        parsed.netloc and (
-            "localhost:8000" in parsed.netloc or 
-            "127.0.0.1:8000" in parsed.netloc or
-            parsed.netloc.endswith(":8000")
-        )
-    ) or (not parsed.netloc and parsed.path.startswith("/api/"))
-    
-    # If it's a backend URL, use it directly; otherwise redirect to frontend
-    if is_backend_url:
-        redirect_url = redirect_uri
-    else:
-        # Frontend URL - redirect there
-        redirect_url = redirect_uri
+    # Backend (/api/...) and frontend URLs are both redirected to as-is
+    redirect_url = redirect_uri
     
     # Create redirect response with HTTP-only cookie
     response = RedirectResponse(url=redirect_url, status_code=status.HTTP_302_FOUND)
     
     # Set HTTP-only cookie with JWT token
-    # Cookie settings for security:
-    # - httpOnly: Prevents JavaScript access (XSS protection)
-    # - secure: Only sent over HTTPS (set to True in production with HTTPS)
-    # - samesite: CSRF protection
-    # - max_age: Token expiration time in seconds
-    cookie_max_age = settings.JWT_ACCESS_TOKEN_EXPIRE_MINUTES * 60
-    response.set_cookie(
-        key="access_token",
-        value=jwt_token,
-        max_age=cookie_max_age,
-        httponly=True,
-        secure=settings.COOKIE_SECURE,
-        samesite=settings.COOKIE_SAMESITE,
-        path="/",  # Available to all paths
-    )
+    response.set_cookie(value=jwt_token, **_AUTH_COOKIE_KWARGS)
     
     logger.info(f"Setting auth cookie and redirecting to: {redirect_url}")
     return response
@@ -358,27 +287,21 @@ async def oauth_callback(
 
 @router.get("/me", response_model=UserResponse)
 async def get_current_user_info(
-    current_user: Dict = Depends(get_current_user_required),
-    db: AsyncSession = Depends(get_db),
+    user: User = Depends(get_current_user_model_required),
 ):
     """Get current authenticated user info (uses cookie or Authorization header)"""
-    result = await db.execute(select(User).where(User.id == current_user.get('id')))
-    user = result.scalar_one_or_none()
-    
-    if not user:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="User not found",
-        )
-    # Build response and include computed super admin flag
-    resp = UserResponse.model_validate(user)
-    try:
-        is_super_admin = (user.email or "").lower() in settings.super_admin_emails_list
-    except Exception:
-        is_super_admin = False
-    # Pydantic model is mutable by default; set attribute
-    resp.is_super_admin = is_super_admin
-    return resp
+    # Fields come straight from the loaded row, so skip re-validating them;
+    # the super admin flag is computed here
+    return UserResponse.model_construct(
+        id=user.id,
+        email=user.email,
+        name=user.name,
+        is_active=user.is_active,
+        is_admin=user.is_admin,
+        is_super_admin=(user.email or "").lower() in settings.super_admin_emails_set,
+        created_at=user.created_at,
+        updated_at=user.updated_at,
+    )
 
 
 @router.post("/logout")
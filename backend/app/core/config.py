@@ -1,7 +1,10 @@
 """
 Application configuration using Pydantic settings
 """
-from typing import Dict, List, Optional
+from __future__ import annotations
+
+from functools import cached_property
+from typing import Dict, FrozenSet, List, Optional
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
@@ -12,6 +15,9 @@ class Settings(BaseSettings):
     DATABASE_URL: str = ""
     DATABASE_POOL_SIZE: int = 10
     DATABASE_MAX_OVERFLOW: int = 20
+    DATABASE_POOL_PRE_PING: bool = False  # SELECT 1 on every pool checkout
+    DATABASE_STATEMENT_CACHE_SIZE: int = 1024  # asyncpg per-connection prepared statement LRU (0 disables, e.g. behind pgbouncer)
+    DATABASE_PREPARED_STATEMENT_CACHE_SIZE: int = 512  # SQLAlchemy per-connection cache of asyncpg PreparedStatement objects
     
     # OAuth/SSO (optional - only required if using OAuth authentication)
     OAUTH_CLIENT_ID: Optional[str] = None
@@ -19,6 +25,7 @@ class Settings(BaseSettings):
     OAUTH_DISCOVERY_URL: Optional[str] = None  # OpenID Connect discovery endpoint (e.g., https://login.microsoftonline.com/{tenant-id}/.well-known/openid-configuration)
     OAUTH_REDIRECT_URI: Optional[str] = None  # Will be constructed from API_BASE_URL if not provided
     OAUTH_SCOPE: Optional[str] = None
+    OAUTH_DISCOVERY_CACHE_TTL: int = 3600  # Seconds to reuse the fetched discovery document
     
     # API Base URL (for constructing OAuth redirect URI)
     API_BASE_URL: str = "http://localhost:8000"  # Backend API base URL
@@ -27,6 +34,7 @@ class Settings(BaseSettings):
     JWT_SECRET_KEY: Optional[str] = None
     JWT_ALGORITHM: str = "HS256"
     JWT_ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
+    JWT_TRUST_IDENTITY_CLAIMS: bool = True  # Resolve users from token claims (stale for at most the token lifetime)
     
     # Application
     APP_NAME: str = "Env360 API"
@@ -99,12 +107,13 @@ class Settings(BaseSettings):
         base_url = self.API_BASE_URL.rstrip('/')
         return f"{base_url}/api/v1/auth/callback"
     
-    @property
-    def super_admin_emails_list(self) -> List[str]:
-        """Parse SUPER_ADMIN_EMAILS into a normalized list of emails"""
-        if not self.SUPER_ADMIN_EMAILS:
-            return []
-        return [e.strip().lower() for e in self.SUPER_ADMIN_EMAILS.split(",") if e.strip()]
+    @cached_property
+    def super_admin_emails_set(self) -> FrozenSet[str]:
+        """
+        Parse SUPER_ADMIN_EMAILS into a normalized set of emails.
+        Parsed once and cached; membership checks on every request are O(1).
+        """
+        return frozenset(e.strip().lower() for e in self.SUPER_ADMIN_EMAILS.split(",") if e.strip())
 
 
 settings = Settings()
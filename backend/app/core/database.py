@@ -10,21 +10,36 @@ from app.core.config import settings
 logger = logging.getLogger(__name__)
 
 # Create async engine with connection timeout settings
-# connect_args for asyncpg: command_timeout, server_settings
+# connect_args for asyncpg: command_timeout, server_settings, prepared statement caches
+# Size the pool per worker: pool_size + max_overflow across all workers (plus DBOS)
+# must stay below PostgreSQL max_connections; ~2x CPU cores of the DB host overall
+# is a good upper bound for active connections.
 engine = create_async_engine(
     settings.DATABASE_URL,
     echo=False,
     future=True,
-    pool_pre_ping=True,  # Test connections before using them
+    # No SELECT 1 before every checkout; staleness is handled by keepalives + pool_recycle
+    # (set DATABASE_POOL_PRE_PING=true behind proxies that drop idle connections silently)
+    pool_pre_ping=settings.DATABASE_POOL_PRE_PING,
     pool_size=settings.DATABASE_POOL_SIZE,
     max_overflow=settings.DATABASE_MAX_OVERFLOW,
     pool_timeout=30,  # Wait up to 30 seconds for a connection from the pool
-    pool_recycle=3600,  # Recycle connections after 1 hour to prevent stale connections
+    pool_recycle=1800,  # Recycle connections after 30 minutes to prevent stale connections
+    pool_use_lifo=True,  # Reuse the most recently returned (warm) connection; idle extras age out
     connect_args={
+        "timeout": 10,  # 10 seconds to establish a connection
         "command_timeout": 10,  # 10 seconds timeout for individual commands
+        # Repeated queries (e.g. the per-request user lookup) reuse server-side prepared statements
+        "statement_cache_size": settings.DATABASE_STATEMENT_CACHE_SIZE,
+        "prepared_statement_cache_size": settings.DATABASE_PREPARED_STATEMENT_CACHE_SIZE,
         "server_settings": {
             "application_name": "env360_backend",
             "statement_timeout": "10000",  # 10 seconds statement timeout at PostgreSQL level
+            # TCP keepalives on the server side of each connection, so dead peers are
+            # detected and dropped without an application-level ping
+            "tcp_keepalives_idle": "30",
+            "tcp_keepalives_interval": "10",
+            "tcp_keepalives_count": "3",
         },
     },
 )
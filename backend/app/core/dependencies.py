@@ -1,12 +1,16 @@
 """
 FastAPI dependencies for authentication and authorization - PostgreSQL version
 """
-from typing import Optional, Dict
+from typing import Optional, Dict, List, Tuple
+from collections import OrderedDict
+from dataclasses import dataclass
+import hashlib
+import time
 from fastapi import Depends, HTTPException, status, Request
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
-from sqlalchemy.orm import selectinload
+from sqlalchemy import String, select, exists, and_, or_, cast, column, func, bindparam, lambda_stmt
+from sqlalchemy.dialects.postgresql import ARRAY, JSONB
 from app.core.database import get_db
 from app.core.security import decode_access_token
 from app.core.config import settings
@@ -14,95 +18,211 @@ from app.models.user import User
 from app.models.permission import PermissionAction, PermissionResource, Permission, UserPermission, ResourcePermission, PermissionScope
 from app.models.project import Project as ProjectModel
 from app.models.environment import Environment as EnvironmentModel
-from app.models.service import Service as ServiceModel
+from app.models.service import Service as ServiceModel, service_environment_association
 
 security = HTTPBearer(auto_error=False)  # Don't auto-raise on missing token
 
 
-async def get_token_from_request(request: Request) -> Optional[str]:
+def get_token_from_request(request: Request) -> Optional[str]:
     """
     Extract JWT token from request - checks cookie first, then Authorization header.
+    The "Bearer " scheme prefix is matched case-insensitively.
     Returns None if no token found.
     """
     # Check cookie first (for browser-based requests)
     token = request.cookies.get("access_token")
+    if token:
+        return token
     
     # Fallback to Authorization header (for API clients)
-    if not token:
-        auth_header = request.headers.get("authorization")
-        if auth_header:
-            if auth_header.startswith("Bearer ") or auth_header.startswith("bearer "):
-                token = auth_header[7:]
-            else:
-                token = auth_header
+    auth_header = request.headers.get("authorization")
+    if not auth_header:
+        return None
+    if auth_header[:7].lower() == "bearer ":
+        return auth_header[7:]
+    return auth_header
+
+
+# Resolved users keyed by a digest of the token (the raw bearer is never retained):
+# digest -> (CurrentUser, valid_until). Entries live at most USER_CACHE_TTL_SECONDS and
+# never past the token's exp, so deactivation and role changes are picked up quickly.
+# Only successfully resolved users are cached.
+USER_CACHE_TTL_SECONDS = 60
+USER_CACHE_MAX_ENTRIES = 10_000
+_user_cache: "OrderedDict[bytes, Tuple[CurrentUser, float]]" = OrderedDict()
+
+
+def _token_cache_key(token: str) -> bytes:
+    return hashlib.blake2b(token.encode("utf-8"), digest_size=16).digest()
+
+
+def _resolve_token(
+    request: Request,
+    credentials: Optional[HTTPAuthorizationCredentials],
+) -> Optional[str]:
+    # Get token from cookie or Authorization header
+    token = get_token_from_request(request)
     
+    # If no token from cookie/header, try credentials (for backward compatibility)
+    if not token and credentials:
+        token = credentials.credentials
     return token
 
 
-async def get_current_user(
+async def _load_active_user(payload: dict, db: AsyncSession) -> Optional[User]:
+    """Load the active user named by a verified token payload"""
+    email: str = payload.get("sub")
+    if email is None:
+        return None
+    
+    # Query user from database; lambda_stmt caches the constructed statement too,
+    # not just its compiled SQL (email becomes a bound parameter)
+    user = await db.scalar(lambda_stmt(lambda: select(User).where(User.email == email)))
+    
+    if user is None or not user.is_active:
+        return None
+    return user
+
+
+@dataclass(frozen=True, slots=True)
+class CurrentUser:
+    """
+    Authenticated user as seen by the GraphQL context and permission helpers.
+    Immutable, so the per-token cache hands out the same instance to every request.
+    """
+    id: str
+    email: str
+    name: str
+    is_active: bool
+    is_admin: bool
+    is_super_admin: bool
+
+    def get(self, key: str, default=None):
+        """Dict-style access (current_user.get('is_admin', False)) for existing callers"""
+        return getattr(self, key, default)
+
+
+def _current_user(user_id: str, email: str, name: str, is_active: bool, is_admin: bool) -> CurrentUser:
+    return CurrentUser(
+        id=user_id,
+        email=email,
+        name=name,
+        is_active=is_active,
+        is_admin=is_admin,
+        is_super_admin=email.lower() in settings.super_admin_emails_set,
+    )
+
+
+def _user_from_claims(payload: dict) -> Optional[CurrentUser]:
+    """Build the current user from identity claims embedded at login, if the token has them"""
+    email = payload.get("sub")
+    user_id = payload.get("uid")
+    name = payload.get("name")
+    is_admin = payload.get("is_admin")
+    if not (email and user_id and isinstance(name, str) and isinstance(is_admin, bool)):
+        return None
+    # Tokens are only issued to active users
+    return _current_user(user_id, email, name, True, is_admin)
+
+
+async def get_current_user_model(
     request: Request,
     credentials: Optional[HTTPAuthorizationCredentials] = Depends(security),
     db: AsyncSession = Depends(get_db),
-) -> Optional[Dict]:
+) -> Optional[User]:
     """
-    Get current authenticated user from JWT token.
+    Get the current authenticated User ORM object from the JWT token.
     Checks cookie first, then Authorization header.
-    Returns None if not authenticated (for optional auth scenarios).
+    Returns None if not authenticated or the user is inactive.
     """
-    # Get token from cookie or Authorization header
-    token = await get_token_from_request(request)
-    
-    # If no token from cookie/header, try credentials (for backward compatibility)
-    if not token and credentials:
-        token = credentials.credentials
-    
+    token = _resolve_token(request, credentials)
     if not token:
         return None
     
     payload = decode_access_token(token)
-    
     if payload is None:
         return None
-    
-    email: str = payload.get("sub")
-    if email is None:
+    return await _load_active_user(payload, db)
+
+
+async def get_current_user(
+    request: Request,
+    credentials: Optional[HTTPAuthorizationCredentials] = Depends(security),
+    db: AsyncSession = Depends(get_db),
+) -> Optional[CurrentUser]:
+    """
+    Get current authenticated user from JWT token (GraphQL context shape).
+    Checks cookie first, then Authorization header.
+    Returns None if not authenticated (for optional auth scenarios).
+    Resolved users are cached per token for up to USER_CACHE_TTL_SECONDS; tokens carrying
+    identity claims are resolved without a database query (JWT_TRUST_IDENTITY_CLAIMS).
+    """
+    token = _resolve_token(request, credentials)
+    if not token:
         return None
     
-    # Query user from database
-    result = await db.execute(select(User).where(User.email == email))
-    user = result.scalar_one_or_none()
+    key = _token_cache_key(token)
+    now = time.time()
+    cached = _user_cache.get(key)
+    if cached is not None:
+        if cached[1] > now:
+            _user_cache.move_to_end(key)
+            return cached[0]
+        del _user_cache[key]
     
-    if user is None or not user.is_active:
+    payload = decode_access_token(token)
+    if payload is None:
         return None
     
-    # Convert to dict for GraphQL context
-    is_super_admin = user.email.lower() in settings.super_admin_emails_list
-    return {
-        "id": user.id,
-        "email": user.email,
-        "name": user.name,
-        "is_active": user.is_active,
-        "is_admin": user.is_admin,
-        "is_super_admin": is_super_admin,
-    }
+    current_user = _user_from_claims(payload) if settings.JWT_TRUST_IDENTITY_CLAIMS else None
+    if current_user is None:
+        # Legacy token without claims (or claims not trusted) - read the user row
+        user = await _load_active_user(payload, db)
+        if user is None:
+            return None
+        current_user = _current_user(user.id, user.email, user.name, user.is_active, user.is_admin)
+    
+    valid_until = now + USER_CACHE_TTL_SECONDS
+    if isinstance(payload.get("exp"), (int, float)):
+        valid_until = min(valid_until, payload["exp"])
+    _user_cache[key] = (current_user, valid_until)
+    if len(_user_cache) > USER_CACHE_MAX_ENTRIES:
+        _user_cache.popitem(last=False)
+    return current_user
+
+
+def _authentication_required() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="Authentication required",
+        headers={"WWW-Authenticate": "Bearer"},
+    )
 
 
 async def get_current_user_required(
-    current_user: Optional[Dict] = Depends(get_current_user),
-) -> Dict:
+    current_user: Optional[CurrentUser] = Depends(get_current_user),
+) -> CurrentUser:
     """
     Require authentication - raises 401 if user is not authenticated.
     Use this for endpoints that require authentication.
     """
     if current_user is None:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Authentication required",
-            headers={"WWW-Authenticate": "Bearer"},
-        )
+        raise _authentication_required()
     return current_user
 
 
+async def get_current_user_model_required(
+    user: Optional[User] = Depends(get_current_user_model),
+) -> User:
+    """
+    Require authentication and return the User ORM object loaded for this request,
+    so endpoints that need the row don't select it a second time.
+    """
+    if user is None:
+        raise _authentication_required()
+    return user
+
+
 # Legacy function for backward compatibility (raises on missing auth)
 security_required = HTTPBearer()
 
@@ -110,7 +230,7 @@ security_required = HTTPBearer()
 async def get_current_user_legacy(
     credentials: HTTPAuthorizationCredentials = Depends(security_required),
     db: AsyncSession = Depends(get_db),
-) -> Dict:
+) -> CurrentUser:
     """Legacy version that raises exception on missing auth (for backward compatibility)"""
     token = credentials.credentials
     payload = decode_access_token(token)
@@ -130,8 +250,7 @@ async def get_current_user_legacy(
         )
     
     # Query user from database
-    result = await db.execute(select(User).where(User.email == email))
-    user = result.scalar_one_or_none()
+    user = await db.scalar(select(User).where(User.email == email))
     
     if user is None:
         raise HTTPException(
@@ -145,16 +264,8 @@ async def get_current_user_legacy(
             detail="User is inactive",
         )
     
-    # Convert to dict for GraphQL context
-    is_super_admin = user.email.lower() in settings.super_admin_emails_list
-    return {
-        "id": user.id,
-        "email": user.email,
-        "name": user.name,
-        "is_active": user.is_active,
-        "is_admin": user.is_admin,
-        "is_super_admin": is_super_admin,
-    }
+    # Convert to the GraphQL context shape
+    return _current_user(user.id, user.email, user.name, user.is_active, user.is_admin)
     """Get current authenticated user from JWT token"""
     token = credentials.credentials
     payload = decode_access_token(token)
@@ -174,8 +285,7 @@ async def get_current_user_legacy(
         )
     
     # Query user from database
-    result = await db.execute(select(User).where(User.email == email))
-    user = result.scalar_one_or_none()
+    user = await db.scalar(select(User).where(User.email == email))
     
     if user is None:
         raise HTTPException(
@@ -200,10 +310,10 @@ async def get_current_user_legacy(
 
 
 async def get_current_admin_user(
-    current_user: Dict = Depends(get_current_user_required),
-) -> Dict:
+    current_user: CurrentUser = Depends(get_current_user_required),
+) -> CurrentUser:
     """Get current user and verify admin status"""
-    if not (current_user.get('is_admin', False) or current_user.get('is_super_admin', False)):
+    if not (current_user.is_admin or current_user.is_super_admin):
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Not enough permissions - Admin access required",
@@ -212,7 +322,7 @@ async def get_current_admin_user(
 
 
 async def check_permission(
-    user: Dict,
+    user: CurrentUser,
     action: PermissionAction,
     resource: PermissionResource,
     resource_id: Optional[str] = None,
@@ -222,7 +332,7 @@ async def check_permission(
     Check if user has a specific permission
     
     Args:
-        user: Current user dict
+        user: Current user
         action: Permission action (READ, WRITE, DELETE, ADMIN)
         resource: Permission resource type
         resource_id: Optional resource ID for resource-specific permissions
@@ -232,31 +342,100 @@ async def check_permission(
         True if user has permission, False otherwise
     """
     # Admins and super admins have all permissions
-    if user.get('is_admin', False) or user.get('is_super_admin', False):
+    if user.is_admin or user.is_super_admin:
         return True
     
-    user_id = user.get('id')
+    user_id = user.id
     if not user_id or not db:
         return False
     
-    # Query user permissions
-    query = select(UserPermission).join(Permission).where(
+    # Existence check only - Postgres stops at the first matching grant
+    condition = exists().where(
+        UserPermission.permission_id == Permission.id,
         UserPermission.user_id == user_id,
         Permission.action == action.value,
         Permission.resource == resource.value,
     )
     
     if resource_id:
-        query = query.where(UserPermission.resource_id == resource_id)
+        condition = condition.where(UserPermission.resource_id == resource_id)
     
-    result = await db.execute(query)
-    user_permissions = result.scalars().all()
-    
-    return len(user_permissions) > 0
+    return bool(await db.scalar(select(condition)))
+
+
+def _permission_cache(db: AsyncSession) -> Dict[tuple, bool]:
+    """
+    Per-session memo of permission results. Sessions live for exactly one request
+    (get_db / GraphQL context), so repeated checks from nested resolvers hit the
+    memo and nothing outlives the request.
+    """
+    return db.info.setdefault("permission_cache", {})
+
+
+def _project_owner_query(scope: PermissionScope, resource_id):
+    """
+    SELECT the owner_id of the project a resource belongs to, for a resource at any
+    scope (the project itself, or the project above an environment/service).
+    resource_id may be a literal or a correlated column.
+    """
+    if scope == PermissionScope.PROJECT:
+        return select(ProjectModel.owner_id).where(ProjectModel.id == resource_id)
+    child = EnvironmentModel if scope == PermissionScope.ENVIRONMENT else ServiceModel
+    return (
+        select(ProjectModel.owner_id)
+        .join(child, child.project_id == ProjectModel.id)
+        .where(child.id == resource_id)
+    )
+
+
+def _resource_permission_clause(
+    user_id: str,
+    action: PermissionAction,
+    scope: PermissionScope,
+    resource_id,
+):
+    """
+    Build a boolean SQL expression that is true when user_id may perform action on the
+    resource: project ownership, a direct grant, or a grant inherited from a parent
+    (service <- its environments <- project, environment <- project).
+    resource_id may be a literal or a correlated column.
+    """
+    # Owners have all permissions on their projects and everything below them
+    is_owner = exists(_project_owner_query(scope, resource_id).where(ProjectModel.owner_id == user_id))
+    if scope == PermissionScope.PROJECT:
+        project_ids = None
+    else:
+        child = EnvironmentModel if scope == PermissionScope.ENVIRONMENT else ServiceModel
+        project_ids = select(child.project_id).where(child.id == resource_id)
+    
+    # Direct grant on the resource itself, or inherited from its environment/project
+    targets = [
+        and_(ResourcePermission.scope == scope.value, ResourcePermission.resource_id == resource_id),
+    ]
+    if scope == PermissionScope.SERVICE:
+        environment_ids = select(service_environment_association.c.environment_id).where(
+            service_environment_association.c.service_id == resource_id
+        )
+        targets.append(and_(
+            ResourcePermission.scope == PermissionScope.ENVIRONMENT.value,
+            ResourcePermission.resource_id.in_(environment_ids),
+        ))
+    if project_ids is not None:
+        targets.append(and_(
+            ResourcePermission.scope == PermissionScope.PROJECT.value,
+            ResourcePermission.resource_id.in_(project_ids),
+        ))
+    # actions is a JSON array such as ["read", "write"]; test membership server-side
+    is_granted = exists().where(
+        ResourcePermission.user_id == user_id,
+        or_(*targets),
+        cast(ResourcePermission.actions, JSONB).contains([action.value]),
+    )
+    return or_(is_owner, is_granted)
 
 
 async def check_resource_permission(
-    user: Dict,
+    user: CurrentUser,
     action: PermissionAction,
     scope: PermissionScope,
     resource_id: str,
@@ -269,8 +448,10 @@ async def check_resource_permission(
     - Environment permissions apply to all services in that environment
     - Project owners have all permissions (READ, WRITE, DELETE, ADMIN) for their projects
     
+    Ownership, direct and inherited grants are evaluated in a single query.
+    
     Args:
-        user: Current user dict
+        user: Current user
         action: Permission action (READ, WRITE, DELETE, ADMIN)
         scope: Permission scope (PROJECT, ENVIRONMENT, SERVICE)
         resource_id: Resource ID at the specified scope
@@ -280,123 +461,96 @@ async def check_resource_permission(
         True if user has permission, False otherwise
     """
     # Admins and super admins have all permissions
-    if user.get('is_admin', False) or user.get('is_super_admin', False):
+    if user.is_admin or user.is_super_admin:
         return True
     
-    user_id = user.get('id')
+    user_id = user.id
     if not user_id:
         return False
     
-    action_str = action.value
-    
-    # Check ownership first - owners have all permissions
-    if scope == PermissionScope.PROJECT:
-        project_result = await db.execute(
-            select(ProjectModel).where(ProjectModel.id == resource_id)
-        )
-        project = project_result.scalar_one_or_none()
-        if project and project.owner_id == user_id:
-            return True
-    elif scope == PermissionScope.ENVIRONMENT:
-        env_result = await db.execute(
-            select(EnvironmentModel).where(EnvironmentModel.id == resource_id)
+    cache = _permission_cache(db)
+    key = ("resource", user_id, action, scope, resource_id)
+    if key not in cache:
+        allowed = await db.scalar(
+            select(_resource_permission_clause(user_id, action, scope, resource_id))
         )
-        env = env_result.scalar_one_or_none()
-        if env and env.project_id:
-            project_result = await db.execute(
-                select(ProjectModel).where(ProjectModel.id == env.project_id)
-            )
-            project = project_result.scalar_one_or_none()
-            if project and project.owner_id == user_id:
-                return True
-    elif scope == PermissionScope.SERVICE:
-        service_result = await db.execute(
-            select(ServiceModel).where(ServiceModel.id == resource_id)
-        )
-        service = service_result.scalar_one_or_none()
-        if service and service.project_id:
-            project_result = await db.execute(
-                select(ProjectModel).where(ProjectModel.id == service.project_id)
-            )
-            project = project_result.scalar_one_or_none()
-            if project and project.owner_id == user_id:
-                return True
-    
-    # Check direct resource permissions
-    # Use enum value for PostgreSQL enum column comparison
-    query = select(ResourcePermission).where(
-        ResourcePermission.user_id == user_id,
-        ResourcePermission.scope == scope.value,  # Use .value to get "project", "environment", or "service"
-        ResourcePermission.resource_id == resource_id,
-    )
-    result = await db.execute(query)
-    resource_perms = result.scalars().all()
+        cache[key] = bool(allowed)
+    return cache[key]
+
+
+async def check_resource_actions(
+    user: CurrentUser,
+    actions: List[PermissionAction],
+    scope: PermissionScope,
+    resource_id: str,
+    db: AsyncSession,
+) -> Dict[PermissionAction, bool]:
+    """
+    Check several actions on one resource (e.g. read/write/delete for a details view).
+    All actions are evaluated as columns of a single SELECT rather than one query each.
     
-    for perm in resource_perms:
-        if action_str in (perm.actions or []):
-            return True
+    Returns:
+        Mapping of action -> whether the user has it
+    """
+    # Admins and super admins have all permissions
+    if user.is_admin or user.is_super_admin:
+        return {action: True for action in actions}
+    
+    user_id = user.id
+    if not user_id or not actions:
+        return {action: False for action in actions}
+    
+    cache = _permission_cache(db)
+    pending = [a for a in actions if ("resource", user_id, a, scope, resource_id) not in cache]
+    if pending:
+        row = (await db.execute(
+            select(*(_resource_permission_clause(user_id, action, scope, resource_id) for action in pending))
+        )).one()
+        for action, allowed in zip(pending, row):
+            cache[("resource", user_id, action, scope, resource_id)] = bool(allowed)
+    return {action: cache[("resource", user_id, action, scope, resource_id)] for action in actions}
+
+
+async def check_resource_permissions(
+    user: CurrentUser,
+    action: PermissionAction,
+    scope: PermissionScope,
+    resource_ids: List[str],
+    db: AsyncSession,
+) -> Dict[str, bool]:
+    """
+    Bulk variant of check_resource_permission for list views.
+    Evaluates every resource id in one query instead of one query per item.
     
-    # Check hierarchical inheritance
-    if scope == PermissionScope.SERVICE:
-        # Check environment-level permission inheritance
-        # Users with WRITE/READ/DELETE/ADMIN access to an environment automatically
-        # have the same access to all services in that environment
-        service_result = await db.execute(
-            select(ServiceModel).where(ServiceModel.id == resource_id)
-        )
-        service = service_result.scalar_one_or_none()
-        if service and service.environment_id:
-            env_query = select(ResourcePermission).where(
-                ResourcePermission.user_id == user_id,
-                ResourcePermission.scope == PermissionScope.ENVIRONMENT.value,  # Use .value for enum
-                ResourcePermission.resource_id == service.environment_id,
-            )
-            env_result = await db.execute(env_query)
-            env_perms = env_result.scalars().all()
-            for perm in env_perms:
-                if action_str in (perm.actions or []):
-                    return True
-        
-        # Check project-level permission inheritance
-        # Users with WRITE/READ/DELETE/ADMIN access to a project automatically
-        # have the same access to all services in that project
-        if service and service.project_id:
-            proj_query = select(ResourcePermission).where(
-                ResourcePermission.user_id == user_id,
-                ResourcePermission.scope == PermissionScope.PROJECT.value,  # Use .value for enum
-                ResourcePermission.resource_id == service.project_id,
-            )
-            proj_result = await db.execute(proj_query)
-            proj_perms = proj_result.scalars().all()
-            for perm in proj_perms:
-                if action_str in (perm.actions or []):
-                    return True
-    
-    elif scope == PermissionScope.ENVIRONMENT:
-        # Check project-level permission inheritance
-        # Users with WRITE/READ/DELETE/ADMIN access to a project automatically
-        # have the same access to all environments in that project
-        env_result = await db.execute(
-            select(EnvironmentModel).where(EnvironmentModel.id == resource_id)
-        )
-        env = env_result.scalar_one_or_none()
-        if env and env.project_id:
-            proj_query = select(ResourcePermission).where(
-                ResourcePermission.user_id == user_id,
-                ResourcePermission.scope == PermissionScope.PROJECT.value,  # Use .value for enum
-                ResourcePermission.resource_id == env.project_id,
-            )
-            proj_result = await db.execute(proj_query)
-            proj_perms = proj_result.scalars().all()
-            for perm in proj_perms:
-                if action_str in (perm.actions or []):
-                    return True
-    
-    return False
+    Returns:
+        Mapping of resource id -> whether the user has the permission
+    """
+    unique_ids = list(dict.fromkeys(resource_ids))
+    if not unique_ids:
+        return {}
+    
+    # Admins and super admins have all permissions
+    if user.is_admin or user.is_super_admin:
+        return {rid: True for rid in unique_ids}
+    
+    user_id = user.id
+    if not user_id:
+        return {rid: False for rid in unique_ids}
+    
+    # One array parameter rather than a VALUES row per id, so the SQL text (and the
+    # server-side prepared statement behind it) is the same whatever the list length
+    ids = func.unnest(bindparam("requested_ids", unique_ids, type_=ARRAY(String))).table_valued(
+        column("id", String), name="requested_ids"
+    )
+    result = await db.execute(
+        select(ids.c.id, _resource_permission_clause(user_id, action, scope, ids.c.id))
+    )
+    allowed = {rid: bool(ok) for rid, ok in result.all()}
+    return {rid: allowed.get(rid, False) for rid in unique_ids}
 
 
 async def can_grant_resource_permission(
-    user: Dict,
+    user: CurrentUser,
     scope: PermissionScope,
     resource_id: str,
     db: AsyncSession,
@@ -406,7 +560,7 @@ async def can_grant_resource_permission(
     Only project owners and admins can grant permissions.
     
     Args:
-        user: Current user dict
+        user: Current user
         scope: Permission scope (PROJECT, ENVIRONMENT, SERVICE)
         resource_id: Resource ID at the specified scope
         db: Database session
@@ -415,53 +569,18 @@ async def can_grant_resource_permission(
         True if user can grant permissions, False otherwise
     """
     # Admins and super admins can always grant permissions
-    if user.get('is_admin', False) or user.get('is_super_admin', False):
+    if user.is_admin or user.is_super_admin:
         return True
     
-    user_id = user.get('id')
+    user_id = user.id
     if not user_id:
         return False
     
-    # For project scope, check if user is the project owner
-    if scope == PermissionScope.PROJECT:
-        result = await db.execute(
-            select(ProjectModel).where(ProjectModel.id == resource_id)
-        )
-        project = result.scalar_one_or_none()
-        if project and project.owner_id == user_id:
-            return True
-    
-    # For environment scope, check if user is the project owner
-    elif scope == PermissionScope.ENVIRONMENT:
-        result = await db.execute(
-            select(EnvironmentModel)
-            .options(selectinload(EnvironmentModel.project))
-            .where(EnvironmentModel.id == resource_id)
-        )
-        env = result.scalar_one_or_none()
-        if env and env.project_id:
-            # Query project separately to check ownership
-            project_result = await db.execute(
-                select(ProjectModel).where(ProjectModel.id == env.project_id)
-            )
-            project = project_result.scalar_one_or_none()
-            if project and project.owner_id == user_id:
-                return True
-    
-    # For service scope, check if user is the project owner
-    elif scope == PermissionScope.SERVICE:
-        result = await db.execute(
-            select(ServiceModel)
-            .where(ServiceModel.id == resource_id)
-        )
-        service = result.scalar_one_or_none()
-        if service and service.project_id:
-            # Query project separately to check ownership
-            project_result = await db.execute(
-                select(ProjectModel).where(ProjectModel.id == service.project_id)
-            )
-            project = project_result.scalar_one_or_none()
-            if project and project.owner_id == user_id:
-                return True
-    
-    return False
+    # Only the owner of the project (directly, or above the environment/service)
+    # can grant - fetch just owner_id in one query
+    cache = _permission_cache(db)
+    key = ("grant", user_id, scope, resource_id)
+    if key not in cache:
+        owner_id = await db.scalar(_project_owner_query(scope, resource_id))
+        cache[key] = owner_id is not None and owner_id == user_id
+    return cache[key]
@@ -4,19 +4,63 @@ Kubernetes manifest apply helpers.
 from __future__ import annotations
 
 from typing import Any, Dict, List, Optional, Tuple, Union
+from collections import OrderedDict
 import asyncio
+import contextlib
+import copy
+import hashlib
 import json
+import threading
 import time
 import yaml
-from app.core.k8s.connection import build_api_client, build_api_client_from_cluster, K8sApiClient, K8sApiException
 try:
-    from kubernetes.dynamic import DynamicClient  # type: ignore
-except Exception:  # pragma: no cover - handled at runtime if client not installed
-    DynamicClient = None  # type: ignore
+    from yaml import CSafeLoader as _YamlLoader  # libyaml C parser
+except ImportError:  # pragma: no cover - PyYAML built without libyaml
+    from yaml import SafeLoader as _YamlLoader  # type: ignore[assignment]
+from app.core.k8s.connection import acquire_api_client, release_api_client, PooledApiClient, load_kubernetes
+try:
+    import orjson  # optional, faster serialization for error messages
+except ImportError:  # pragma: no cover - orjson optional
+    orjson = None  # type: ignore
 
 
 # Client construction is provided by core.k8s.connection; reuse it here.
 
+# Parsed YAML manifests keyed by a digest of their text: digest -> documents.
+# Generated manifests are re-applied verbatim, so repeats skip the parse entirely.
+YAML_PARSE_CACHE_MAX_ENTRIES = 256
+_yaml_parse_cache: "OrderedDict[bytes, List[Dict[str, Any]]]" = OrderedDict()
+
+
+def _parse_yaml_documents(manifest: str) -> List[Dict[str, Any]]:
+    """
+    Parse a (multi-document) YAML string into a list of mappings, skipping empty documents.
+    Callers get their own copy since apply may mutate the documents.
+    """
+    key = hashlib.blake2b(manifest.encode("utf-8"), digest_size=16).digest()
+    docs = _yaml_parse_cache.get(key)
+    if docs is None:
+        docs = []
+        for doc in yaml.load_all(manifest, Loader=_YamlLoader):
+            if not doc:
+                continue
+            if not isinstance(doc, dict):
+                raise ValueError("Each YAML document must be a mapping/object")
+            docs.append(doc)
+        _yaml_parse_cache[key] = docs
+        if len(_yaml_parse_cache) > YAML_PARSE_CACHE_MAX_ENTRIES:
+            _yaml_parse_cache.popitem(last=False)
+    else:
+        _yaml_parse_cache.move_to_end(key)
+    return copy.deepcopy(docs)
+
+
+def _doc_preview(doc: Dict[str, Any]) -> str:
+    """Short JSON rendering of a manifest document for error messages."""
+    if orjson is not None:
+        return orjson.dumps(doc, default=str).decode("utf-8")[:200]
+    return json.dumps(doc, default=str)[:200]
+
 
 def _ensure_list_of_dicts(manifest: Union[str, Dict[str, Any], List[Dict[str, Any]]]) -> List[Dict[str, Any]]:
     """
@@ -26,14 +70,7 @@ def _ensure_list_of_dicts(manifest: Union[str, Dict[str, Any], List[Dict[str, An
     - List of dicts
     """
     if isinstance(manifest, str):
-        docs: List[Dict[str, Any]] = []
-        for doc in yaml.safe_load_all(manifest):
-            if not doc:
-                continue
-            if not isinstance(doc, dict):
-                raise ValueError("Each YAML document must be a mapping/object")
-            docs.append(doc)
-        return docs
+        return _parse_yaml_documents(manifest)
     if isinstance(manifest, list):
         return manifest
     if isinstance(manifest, dict):
@@ -41,6 +78,87 @@ def _ensure_list_of_dicts(manifest: Union[str, Dict[str, Any], List[Dict[str, An
     raise ValueError("Unsupported manifest type")
 
 
+class _DynamicResources:
+    """
+    Per-ApiClient DynamicClient plus the dynamic resources already resolved through it.
+    Building a DynamicClient and resolving a resource both go through API discovery,
+    so each happens once per client rather than once per call. Blocking.
+    """
+
+    def __init__(self, api_client: Any) -> None:
+        self.api_client = api_client
+        self._dyn: Any = None
+        self._resources: Dict[Tuple[str, str], Any] = {}
+        self._lock = threading.Lock()
+
+    def get(self, api_version: str, kind: str) -> Any:
+        key = (api_version, kind)
+        resource = self._resources.get(key)
+        if resource is None:
+            with self._lock:
+                resource = self._resources.get(key)
+                if resource is None:
+                    if self._dyn is None:
+                        self._dyn = load_kubernetes().DynamicClient(self.api_client)
+                    resource = self._dyn.resources.get(api_version=api_version, kind=kind)  # type: ignore
+                    self._resources[key] = resource
+        return resource
+
+
+def _dynamic_for(pooled: PooledApiClient) -> _DynamicResources:
+    """The _DynamicResources kept alongside a pooled client, created on first use."""
+    dynamic = pooled.extras.get("dynamic")
+    if dynamic is None:
+        dynamic = pooled.extras.setdefault("dynamic", _DynamicResources(pooled.api_client))
+    return dynamic
+
+
+# Label stamped on every document applied with an apply_id (see poll_bundle_ready)
+APPLY_ID_LABEL = "env360/apply-id"
+
+# Kinds the rest of a bundle may depend on; they are applied before everything else
+_FIRST_TIER_KINDS = frozenset({"Namespace", "CustomResourceDefinition"})
+
+
+def _apply_one(resource: Any, doc: Dict[str, Any], field_manager: str) -> str:
+    """
+    Apply one validated manifest document and return a summary line.
+    Blocking (kubernetes.dynamic is synchronous); run it in a worker thread.
+    """
+    kind = doc["kind"]
+    metadata = doc["metadata"]
+    name = metadata["name"]
+    namespace = metadata.get("namespace")
+    namespaced = getattr(resource, "namespaced", False) and namespace
+
+    # Try server-side apply first; fall back to strategic-merge-patch on 409
+    try:
+        patch_kwargs: Dict[str, Any] = dict(
+            name=name,
+            body=doc,
+            content_type="application/apply-patch+yaml",
+            field_manager=field_manager,
+            force=True,
+        )
+        if namespaced:
+            patch_kwargs["namespace"] = namespace
+        resource.patch(**patch_kwargs)  # type: ignore
+        return f"applied {kind}/{name}{' in ' + namespace if namespace else ''}"
+    except load_kubernetes().ApiException as ssa_err:
+        if getattr(ssa_err, "status", None) != 409:
+            raise
+    # Field-manager conflict – fall back to strategic-merge-patch
+    merge_kwargs: Dict[str, Any] = dict(
+        name=name,
+        body=doc,
+        content_type="application/strategic-merge-patch+json",
+    )
+    if namespaced:
+        merge_kwargs["namespace"] = namespace
+    resource.patch(**merge_kwargs)  # type: ignore
+    return f"patched {kind}/{name}{' in ' + namespace if namespace else ''}"
+
+
 async def apply_manifest(
     manifest: Union[str, Dict[str, Any], List[Dict[str, Any]]],
     *,
@@ -53,86 +171,72 @@ async def apply_manifest(
     client_cert: Optional[str] = None,
     client_ca: Optional[str] = None,
     field_manager: str = "env360",
+    apply_id: Optional[str] = None,
 ) -> Tuple[bool, str]:
     """
     Apply a Kubernetes manifest (server-side: create or patch) using the python client.
     - `manifest` can be YAML string, a dict, or list of dicts.
     - Credentials can be passed directly or via a `cluster` model instance.
+    - `apply_id` labels every document with APPLY_ID_LABEL so `poll_bundle_ready`
+      can follow the whole bundle with one watch per resource type.
     Returns (ok, message).
     """
-    if DynamicClient is None or K8sApiClient is None:
+    kube = load_kubernetes()
+    if kube is None:
         return False, "kubernetes python client not installed on server."
 
-    if cluster is not None:
-        api_client, err = build_api_client_from_cluster(cluster)
-    else:
-        api_client, err = build_api_client(
-            api_url=api_url,
-            auth_method=auth_method,
-            token=token,
-            kubeconfig_content=kubeconfig_content,
-            client_key=client_key,
-            client_cert=client_cert,
-            client_ca=client_ca,
-        )
-    if err:
-        return False, err
-    if api_client is None:
-        return False, "Failed to create Kubernetes client."
-
-    dyn = DynamicClient(api_client)  # type: ignore
-    docs = _ensure_list_of_dicts(manifest)
-    applied: List[str] = []
+    pooled, err = acquire_api_client(cluster, dict(
+        api_url=api_url,
+        auth_method=auth_method,
+        token=token,
+        kubeconfig_content=kubeconfig_content,
+        client_key=client_key,
+        client_cert=client_cert,
+        client_ca=client_ca,
+    ))
+    if pooled is None:
+        return False, err or "Failed to create Kubernetes client."
+    dynamic = _dynamic_for(pooled)
+
+    def discover(docs: List[Dict[str, Any]]) -> List[Any]:
+        return [dynamic.get(doc["apiVersion"], doc["kind"]) for doc in docs]
+
     try:
+        docs = _ensure_list_of_dicts(manifest)
         for doc in docs:
-            # Basic validations
-            api_version = doc.get("apiVersion")
-            kind = doc.get("kind")
-            metadata = doc.get("metadata", {}) or {}
-            name = metadata.get("name")
-            namespace = metadata.get("namespace")
-            if not api_version or not kind or not name:
-                raise ValueError(f"Manifest missing apiVersion/kind/metadata.name: {json.dumps(doc)[:200]}")
-
-            resource = dyn.resources.get(api_version=api_version, kind=kind)  # type: ignore
-            body = doc
-            namespaced = getattr(resource, "namespaced", False) and namespace
-
-            # Try server-side apply first; fall back to strategic-merge-patch on 409
-            try:
-                patch_kwargs: Dict[str, Any] = dict(
-                    name=name,
-                    body=body,
-                    content_type="application/apply-patch+yaml",
-                    field_manager=field_manager,
-                    force=True,
-                )
-                if namespaced:
-                    patch_kwargs["namespace"] = namespace
-                resource.patch(**patch_kwargs)  # type: ignore
-                applied.append(f"applied {kind}/{name}{' in ' + namespace if namespace else ''}")
-            except K8sApiException as ssa_err:
-                if getattr(ssa_err, "status", None) == 409:
-                    # Field-manager conflict – fall back to strategic-merge-patch
-                    merge_kwargs: Dict[str, Any] = dict(
-                        name=name,
-                        body=body,
-                        content_type="application/strategic-merge-patch+json",
-                    )
-                    if namespaced:
-                        merge_kwargs["namespace"] = namespace
-                    resource.patch(**merge_kwargs)  # type: ignore
-                    applied.append(f"patched {kind}/{name}{' in ' + namespace if namespace else ''}")
-                else:
-                    raise
+            # Basic validations (all documents, before anything is applied)
+            metadata = doc.get("metadata") or {}
+            if not (doc.get("apiVersion") and doc.get("kind") and metadata.get("name")):
+                raise ValueError(f"Manifest missing apiVersion/kind/metadata.name: {_doc_preview(doc)}")
+
+        if apply_id:
+            if not isinstance(manifest, str):
+                # Label copies; the caller's dicts are left untouched
+                docs = copy.deepcopy(docs)
+            for doc in docs:
+                metadata = doc["metadata"]
+                metadata["labels"] = {**(metadata.get("labels") or {}), APPLY_ID_LABEL: apply_id}
+
+        # Discovery runs in a single worker thread; the patches of a tier then run concurrently
+        resources = await asyncio.to_thread(discover, docs)
+        applied: List[str] = [""] * len(docs)
+        first_tier = [i for i, doc in enumerate(docs) if doc["kind"] in _FIRST_TIER_KINDS]
+        second_tier = [i for i, doc in enumerate(docs) if doc["kind"] not in _FIRST_TIER_KINDS]
+        for tier in (first_tier, second_tier):
+            # Let every patch of the tier finish before reporting, so none outlives the client
+            results = await asyncio.gather(
+                *(asyncio.to_thread(_apply_one, resources[i], docs[i], field_manager) for i in tier),
+                return_exceptions=True,
+            )
+            for i, result in zip(tier, results):
+                if isinstance(result, BaseException):
+                    raise result
+                applied[i] = result
         return True, "; ".join(applied) if applied else "No resources to apply."
     except Exception as e:
         return False, str(e)
     finally:
-        try:
-            api_client.close()  # type: ignore[attr-defined]
-        except Exception:
-            pass
+        release_api_client(pooled)
 
 
 async def apply_namespace(manifest: Dict[str, Any], **kwargs: Any) -> Tuple[bool, str]:
@@ -160,70 +264,53 @@ async def apply_manifest_from_string(yaml_text: str, **kwargs: Any) -> Tuple[boo
 # Resource readiness polling
 # ---------------------------------------------------------------------------
 
-def _check_namespace_ready(resource: Any, name: str) -> Tuple[bool, str]:
+# Checkers evaluate an already-fetched object as a plain dict (a watch event's raw
+# object, or ResourceInstance.to_dict() after a GET) and return (ready, message);
+# fetching is left to poll_resource_ready.
+
+def _check_namespace_ready(obj: Dict[str, Any], name: str, namespace: Optional[str]) -> Tuple[bool, str]:
     """Return (ready, message) for a Namespace."""
-    try:
-        obj = resource.get(name=name)  # type: ignore
-        phase = (obj.status or {}).get("phase", "Unknown") if hasattr(obj, "status") else "Unknown"
-        if str(phase).lower() == "active":
-            return True, f"Namespace {name} is Active"
-        return False, f"Namespace {name} phase={phase}"
-    except Exception as e:
-        return False, str(e)
+    phase = (obj.get("status") or {}).get("phase", "Unknown")
+    if str(phase).lower() == "active":
+        return True, f"Namespace {name} is Active"
+    return False, f"Namespace {name} phase={phase}"
 
 
-def _check_service_account_ready(resource: Any, name: str, namespace: str) -> Tuple[bool, str]:
+def _check_service_account_ready(obj: Dict[str, Any], name: str, namespace: Optional[str]) -> Tuple[bool, str]:
     """Return (ready, message) for a ServiceAccount (exists = ready)."""
-    try:
-        resource.get(name=name, namespace=namespace)  # type: ignore
-        return True, f"ServiceAccount {name} exists in {namespace}"
-    except Exception as e:
-        return False, str(e)
+    return True, f"ServiceAccount {name} exists in {namespace}"
 
 
-def _check_deployment_ready(resource: Any, name: str, namespace: str) -> Tuple[bool, str]:
+def _check_deployment_ready(obj: Dict[str, Any], name: str, namespace: Optional[str]) -> Tuple[bool, str]:
     """Return (ready, message) for a Deployment (all replicas available)."""
-    try:
-        obj = resource.get(name=name, namespace=namespace)  # type: ignore
-        status = obj.status if hasattr(obj, "status") else {}
-        replicas = (obj.spec or {}).get("replicas", 1) if hasattr(obj, "spec") else 1
-        available = int((status or {}).get("availableReplicas") or 0)
-        updated = int((status or {}).get("updatedReplicas") or 0)
-        ready = int((status or {}).get("readyReplicas") or 0)
-        if available >= replicas and updated >= replicas and ready >= replicas:
-            return True, f"Deployment {name} ready ({available}/{replicas} available)"
-        return False, f"Deployment {name}: {available}/{replicas} available, {ready}/{replicas} ready"
-    except Exception as e:
-        return False, str(e)
+    status = obj.get("status") or {}
+    replicas = (obj.get("spec") or {}).get("replicas", 1)
+    available = int(status.get("availableReplicas") or 0)
+    updated = int(status.get("updatedReplicas") or 0)
+    ready = int(status.get("readyReplicas") or 0)
+    if available >= replicas and updated >= replicas and ready >= replicas:
+        return True, f"Deployment {name} ready ({available}/{replicas} available)"
+    return False, f"Deployment {name}: {available}/{replicas} available, {ready}/{replicas} ready"
 
 
-def _check_service_ready(resource: Any, name: str, namespace: str) -> Tuple[bool, str]:
+def _check_service_ready(obj: Dict[str, Any], name: str, namespace: Optional[str]) -> Tuple[bool, str]:
     """Return (ready, message) for a Service (exists and has a clusterIP or endpoints)."""
-    try:
-        obj = resource.get(name=name, namespace=namespace)  # type: ignore
-        spec = obj.spec if hasattr(obj, "spec") else {}
-        cluster_ip = (spec or {}).get("clusterIP", "")
-        svc_type = (spec or {}).get("type", "ClusterIP")
-        if svc_type == "LoadBalancer":
-            status = obj.status if hasattr(obj, "status") else {}
-            ingress = ((status or {}).get("loadBalancer") or {}).get("ingress") or []
-            if ingress:
-                return True, f"Service {name} LoadBalancer ready (ingress assigned)"
-            return False, f"Service {name} LoadBalancer pending (no ingress yet)"
-        if cluster_ip and cluster_ip != "None":
-            return True, f"Service {name} ready (clusterIP={cluster_ip})"
-        return False, f"Service {name} exists but no clusterIP assigned yet"
-    except Exception as e:
-        return False, str(e)
-
-
-def _check_virtual_service_ready(resource: Any, name: str, namespace: str) -> Tuple[bool, str]:
+    spec = obj.get("spec") or {}
+    cluster_ip = spec.get("clusterIP", "")
+    svc_type = spec.get("type", "ClusterIP")
+    if svc_type == "LoadBalancer":
+        ingress = ((obj.get("status") or {}).get("loadBalancer") or {}).get("ingress") or []
+        if ingress:
+            return True, f"Service {name} LoadBalancer ready (ingress assigned)"
+        return False, f"Service {name} LoadBalancer pending (no ingress yet)"
+    if cluster_ip and cluster_ip != "None":
+        return True, f"Service {name} ready (clusterIP={cluster_ip})"
+    return False, f"Service {name} exists but no clusterIP assigned yet"
+
+
+def _check_virtual_service_ready(obj: Dict[str, Any], name: str, namespace: Optional[str]) -> Tuple[bool, str]:
     """Return (ready, message) for a VirtualService / Ingress route (exists = ready)."""
-    try:
-        resource.get(name=name, namespace=namespace)  # type: ignore
-        return True, f"Route {name} exists in {namespace}"
-    except Exception as e:
-        return False, str(e)
+    return True, f"Route {name} exists in {namespace}"
 
 
 # Map of (kind) -> (apiVersion, checker_fn, is_namespaced)
@@ -239,6 +326,67 @@ _READINESS_CHECKERS: Dict[str, Any] = {
 }
 
 
+def _check_once(resource: Any, checker_fn: Any, name: str, namespace: Optional[str]) -> Tuple[bool, str]:
+    """GET the object and run its checker (blocking)."""
+    try:
+        if namespace:
+            obj = resource.get(name=name, namespace=namespace)  # type: ignore
+        else:
+            obj = resource.get(name=name)  # type: ignore
+        return checker_fn(obj.to_dict(), name, namespace)
+    except Exception as e:
+        return False, str(e)
+
+
+def _watch_until_ready(
+    resource: Any,
+    checker_fn: Any,
+    names: List[str],
+    namespace: Optional[str],
+    deadline: float,
+    label_selector: Optional[str] = None,
+) -> Dict[str, Tuple[bool, str]]:
+    """
+    Watch objects of one resource type and run the checker on every event until all
+    `names` report ready or the deadline passes (blocking). Returns name -> (ready, message).
+
+    Without a label selector a single named object is watched; with one, every object
+    carrying the label is followed on one watch. The first events carry the current
+    state, so objects that are already ready count at once. The watch is re-opened when
+    the API server closes it early. Raises ApiException when watching is refused.
+    """
+    results: Dict[str, Tuple[bool, str]] = {n: (False, f"Waiting for {n}") for n in names}
+    pending = set(names)
+    while pending:
+        remaining = int(deadline - time.monotonic())
+        if remaining <= 0:
+            break
+        watch_kwargs: Dict[str, Any] = dict(timeout=remaining)
+        if label_selector:
+            watch_kwargs["label_selector"] = label_selector
+        else:
+            watch_kwargs["name"] = names[0]
+        if namespace:
+            watch_kwargs["namespace"] = namespace
+        with contextlib.closing(resource.watch(**watch_kwargs)) as events:  # type: ignore
+            for event in events:
+                name = ((event.get("raw_object") or {}).get("metadata") or {}).get("name")
+                if name not in results:
+                    continue
+                if event.get("type") == "DELETED":
+                    results[name] = (False, f"{name} was deleted")
+                    pending.add(name)
+                    continue
+                results[name] = checker_fn(event["raw_object"], name, namespace)
+                if results[name][0]:
+                    pending.discard(name)
+                else:
+                    pending.add(name)
+                if not pending:
+                    break
+    return results
+
+
 async def poll_resource_ready(
     manifest: Dict[str, Any],
     *,
@@ -248,15 +396,18 @@ async def poll_resource_ready(
     **kwargs: Any,
 ) -> Tuple[bool, str]:
     """
-    Poll a Kubernetes resource until it is ready or timeout is reached.
+    Wait for a Kubernetes resource to become ready or for the timeout to pass.
+    Status changes are followed with a watch; if the API server refuses to watch the
+    resource, it is polled every `poll_interval` seconds instead.
     `manifest` must be a dict with apiVersion, kind, and metadata.name (+ namespace if applicable).
     Returns (ok, message).
     """
-    if DynamicClient is None or K8sApiClient is None:
+    kube = load_kubernetes()
+    if kube is None:
         return False, "kubernetes python client not installed on server."
 
     kind = manifest.get("kind", "")
-    metadata = manifest.get("metadata", {}) or {}
+    metadata = manifest.get("metadata") or {}
     name = metadata.get("name", "")
     namespace = metadata.get("namespace")
 
@@ -266,36 +417,118 @@ async def poll_resource_ready(
         return True, f"No readiness check defined for kind={kind}; assuming ready."
 
     api_version, checker_fn, is_namespaced = checker_entry
+    if not is_namespaced:
+        namespace = None
+
+    pooled, err = acquire_api_client(cluster, kwargs)
+    if pooled is None:
+        return False, err or "Failed to create Kubernetes client."
 
-    if cluster is not None:
-        api_client, err = build_api_client_from_cluster(cluster)
-    else:
-        api_client, err = build_api_client(**kwargs)
-    if err:
-        return False, err
-    if api_client is None:
-        return False, "Failed to create Kubernetes client."
-
-    dyn = DynamicClient(api_client)  # type: ignore
-    resource = dyn.resources.get(api_version=api_version, kind=kind)  # type: ignore
     start = time.monotonic()
+    deadline = start + timeout_seconds
     last_msg = ""
     try:
+        resource = await asyncio.to_thread(_dynamic_for(pooled).get, api_version, kind)
+        try:
+            results = await asyncio.to_thread(
+                _watch_until_ready, resource, checker_fn, [name], namespace, deadline
+            )
+            ok, last_msg = results[name]
+            if ok:
+                return True, last_msg
+            return False, f"Timeout ({timeout_seconds}s) waiting for {kind}/{name}: {last_msg}"
+        except kube.ApiException as watch_err:
+            last_msg = str(watch_err)
+        # Watch refused (e.g. no watch verb for this resource); fall back to polling
         while True:
             elapsed = time.monotonic() - start
             if elapsed >= timeout_seconds:
                 return False, f"Timeout ({timeout_seconds}s) waiting for {kind}/{name}: {last_msg}"
-            if is_namespaced:
-                ok, last_msg = checker_fn(resource, name, namespace)
-            else:
-                ok, last_msg = checker_fn(resource, name)
+            ok, last_msg = await asyncio.to_thread(_check_once, resource, checker_fn, name, namespace)
             if ok:
                 return True, last_msg
             await asyncio.sleep(poll_interval)
     except Exception as e:
         return False, str(e)
     finally:
+        release_api_client(pooled)
+
+
+async def poll_bundle_ready(
+    docs: List[Dict[str, Any]],
+    apply_id: str,
+    *,
+    cluster: Optional[Any] = None,
+    timeout_seconds: int = 300,
+    poll_interval: int = 10,
+    **kwargs: Any,
+) -> Tuple[bool, str]:
+    """
+    Wait for every resource of a bundle applied with `apply_manifest(..., apply_id=...)`.
+    Objects are followed with one label-selector watch per (apiVersion, kind, namespace)
+    rather than one watch per object; groups the API server refuses to watch are polled
+    every `poll_interval` seconds. Kinds without a readiness check count as ready.
+    Returns (ok, message).
+    """
+    kube = load_kubernetes()
+    if kube is None:
+        return False, "kubernetes python client not installed on server."
+
+    groups: Dict[Tuple[str, str, Optional[str]], List[str]] = {}
+    for doc in docs:
+        kind = doc.get("kind", "")
+        checker_entry = _READINESS_CHECKERS.get(kind)
+        if not checker_entry:
+            continue
+        api_version, _, is_namespaced = checker_entry
+        metadata = doc.get("metadata") or {}
+        namespace = metadata.get("namespace") if is_namespaced else None
+        groups.setdefault((api_version, kind, namespace), []).append(metadata.get("name", ""))
+    if not groups:
+        return True, "No readiness checks defined for this bundle; assuming ready."
+
+    pooled, err = acquire_api_client(cluster, kwargs)
+    if pooled is None:
+        return False, err or "Failed to create Kubernetes client."
+
+    deadline = time.monotonic() + timeout_seconds
+    label_selector = f"{APPLY_ID_LABEL}={apply_id}"
+    dynamic = _dynamic_for(pooled)
+
+    async def wait_group(api_version: str, kind: str, namespace: Optional[str], names: List[str]) -> Dict[str, Tuple[bool, str]]:
+        checker_fn = _READINESS_CHECKERS[kind][1]
+        resource = await asyncio.to_thread(dynamic.get, api_version, kind)
         try:
-            api_client.close()  # type: ignore[attr-defined]
-        except Exception:
+            return await asyncio.to_thread(
+                _watch_until_ready, resource, checker_fn, names, namespace, deadline, label_selector
+            )
+        except kube.ApiException:
             pass
+        # Watch refused (e.g. no watch verb for this resource); fall back to polling
+        results: Dict[str, Tuple[bool, str]] = {}
+        while True:
+            for name in names:
+                if not results.get(name, (False, ""))[0]:
+                    results[name] = await asyncio.to_thread(_check_once, resource, checker_fn, name, namespace)
+            if all(ok for ok, _ in results.values()) or time.monotonic() >= deadline:
+                return results
+            await asyncio.sleep(poll_interval)
+
+    try:
+        group_results = await asyncio.gather(
+            *(wait_group(api_version, kind, namespace, names) for (api_version, kind, namespace), names in groups.items())
+        )
+        messages: List[str] = []
+        pending: List[str] = []
+        for (_, kind, _), results in zip(groups, group_results):
+            for name, (ok, msg) in results.items():
+                messages.append(msg)
+                if not ok:
+                    pending.append(f"{kind}/{name}: {msg}")
+        if pending:
+            return False, f"Timeout ({timeout_seconds}s) waiting for " + "; ".join(pending)
+        return True, "; ".join(messages)
+    except Exception as e:
+        return False, str(e)
+    finally:
+        release_api_client(pooled)
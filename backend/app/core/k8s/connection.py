@@ -2,24 +2,192 @@
 Kubernetes API authenticated connection utilities.
 """
 from __future__ import annotations
-from typing import Tuple, List, Optional, Any
+from typing import Tuple, Optional, Any, Dict
+from collections import OrderedDict
+from types import SimpleNamespace
 import tempfile
-import yaml
+import functools
+import hashlib
+import json
 import os
+import ssl
+import threading
+import time
+import yaml
+try:
+    from yaml import CSafeLoader as _YamlLoader  # libyaml C parser
+except ImportError:  # pragma: no cover - PyYAML built without libyaml
+    from yaml import SafeLoader as _YamlLoader  # type: ignore[assignment]
 from app.core.security import decrypt_secret
-from typing import Tuple, Optional
 
-try:
-    from kubernetes.client import Configuration as K8sConfiguration, ApiClient as K8sApiClient
-    from kubernetes.client import AuthenticationApi as K8sAuthenticationApi
-    from kubernetes import config as k8s_config
-    from kubernetes.client.rest import ApiException as K8sApiException  # type: ignore
-except Exception:
-    K8sConfiguration = None  # type: ignore
-    K8sApiClient = None  # type: ignore
-    K8sAuthenticationApi = None  # type: ignore
-    k8s_config = None  # type: ignore
-    K8sApiException = Exception  # type: ignore
+# The kubernetes package is large (swagger models, urllib3, ...), so it is imported on
+# the first cluster operation instead of at process start.
+_kubernetes: Optional[SimpleNamespace] = None
+_kubernetes_loaded = False
+
+
+def load_kubernetes() -> Optional[SimpleNamespace]:
+    """
+    Import the kubernetes client on first use and return its entry points
+    (Configuration, ApiClient, AuthenticationApi, config, ApiException, DynamicClient),
+    or None when the package is not installed.
+    """
+    global _kubernetes, _kubernetes_loaded
+    if not _kubernetes_loaded:
+        try:
+            from kubernetes import config as k8s_config
+            from kubernetes.client import ApiClient, AuthenticationApi, Configuration
+            from kubernetes.client.rest import ApiException
+            from kubernetes.dynamic import DynamicClient
+        except Exception:
+            _kubernetes = None
+        else:
+            _kubernetes = SimpleNamespace(
+                Configuration=Configuration,
+                ApiClient=ApiClient,
+                AuthenticationApi=AuthenticationApi,
+                config=k8s_config,
+                ApiException=ApiException,
+                DynamicClient=DynamicClient,
+            )
+        _kubernetes_loaded = True
+    return _kubernetes
+
+
+# Key pairs pass through tmpfs when available, so key material never reaches a disk
+_PEM_TMP_DIR = "/dev/shm" if os.path.isdir("/dev/shm") else None
+
+
+def _load_key_pair(ssl_context: ssl.SSLContext, client_cert: str, client_key: str) -> None:
+    """
+    Load a PEM cert + key into ssl_context. ssl only loads key pairs from a path, so both
+    go into one 0600 temp file (a single unbuffered write) that is unlinked right after.
+    """
+    fd, path = tempfile.mkstemp(suffix=".pem", dir=_PEM_TMP_DIR)
+    try:
+        try:
+            os.write(fd, f"{client_cert.strip()}\n{client_key.strip()}\n".encode("utf-8"))
+        finally:
+            os.close(fd)
+        ssl_context.load_cert_chain(certfile=path)
+    finally:
+        os.unlink(path)
+
+
+# Parsed SSLContexts keyed by a digest of the PEM material they were built from, so
+# every ApiClient for the same clientCert credentials shares one context (no repeated
+# PEM/X.509 parsing or temp-file write).
+SSL_CONTEXT_CACHE_MAX_ENTRIES = 64
+_ssl_contexts: "OrderedDict[bytes, ssl.SSLContext]" = OrderedDict()
+_ssl_contexts_lock = threading.Lock()
+
+
+def _client_ssl_context(client_key: str, client_cert: str, client_ca: str) -> ssl.SSLContext:
+    """
+    Return an SSLContext that trusts client_ca and presents client_cert/client_key.
+    The CA is loaded from memory; the context holds the parsed key pair and needs no
+    files afterwards. Contexts are cached per credentials and safe to share.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    for pem in (client_key, client_cert, client_ca):
+        digest.update(pem.encode("utf-8"))
+        digest.update(b"\0")
+    key = digest.digest()
+    with _ssl_contexts_lock:
+        ssl_context = _ssl_contexts.get(key)
+        if ssl_context is not None:
+            _ssl_contexts.move_to_end(key)
+            return ssl_context
+
+    ssl_context = ssl.create_default_context(cadata=client_ca)
+    _load_key_pair(ssl_context, client_cert, client_key)
+    with _ssl_contexts_lock:
+        _ssl_contexts[key] = ssl_context
+        if len(_ssl_contexts) > SSL_CONTEXT_CACHE_MAX_ENTRIES:
+            _ssl_contexts.popitem(last=False)
+    return ssl_context
+
+
+def _use_ssl_context(api_client: Any, ssl_context: ssl.SSLContext) -> None:
+    """
+    Make an ApiClient's urllib3 pool use ssl_context. The bundled CA file the client
+    configures by default is dropped so only the cluster CA is trusted.
+    """
+    pool_kw = api_client.rest_client.pool_manager.connection_pool_kw
+    pool_kw.pop("ca_certs", None)
+    pool_kw["ssl_context"] = ssl_context
+
+
+def _token_client(host: str, credentials: Dict[str, Optional[str]]) -> Tuple[Optional[Any], Optional[str]]:
+    if not host:
+        return None, "Cluster API URL is not configured."
+    token = credentials.get("token")
+    if not token:
+        return None, "Token is not configured."
+    kube = load_kubernetes()
+    cfg = kube.Configuration()
+    cfg.host = host
+    cfg.api_key = {'authorization': token}
+    cfg.api_key_prefix = {'authorization': 'Bearer'}
+    return kube.ApiClient(cfg), None
+
+
+def _load_kubeconfig(content: str) -> Any:
+    """
+    Parse kubeconfig content. JSON kubeconfigs (kubectl config view -o json) go through
+    the much faster json parser; anything else, or JSON that fails to parse, is YAML.
+    """
+    stripped = content.lstrip()
+    if stripped[:1] == "{":
+        try:
+            return json.loads(stripped)
+        except ValueError:
+            pass
+    return yaml.load(content, Loader=_YamlLoader)
+
+
+def _kubeconfig_client(host: str, credentials: Dict[str, Optional[str]]) -> Tuple[Optional[Any], Optional[str]]:
+    kubeconfig_content = credentials.get("kubeconfig_content")
+    if not kubeconfig_content:
+        return None, "Kubeconfig content is not configured."
+    try:
+        kube = load_kubernetes()
+        kc = _load_kubeconfig(kubeconfig_content)
+        # Load into a private Configuration; without client_configuration the loader
+        # overwrites the process-wide default that every ApiClient() would pick up
+        cfg = kube.Configuration()
+        kube.config.load_kube_config_from_dict(kc, client_configuration=cfg, persist_config=False)
+        return kube.ApiClient(cfg), None
+    except Exception as e:
+        return None, f"Kubeconfig load failed: {e}"
+
+
+def _client_cert_client(host: str, credentials: Dict[str, Optional[str]]) -> Tuple[Optional[Any], Optional[str]]:
+    if not host:
+        return None, "Cluster API URL is not configured."
+    client_key = credentials.get("client_key")
+    client_cert = credentials.get("client_cert")
+    client_ca = credentials.get("client_ca")
+    if not (client_key and client_cert and client_ca):
+        return None, "Client key/cert/CA are required for clientCert."
+    kube = load_kubernetes()
+    ssl_context = _client_ssl_context(client_key, client_cert, client_ca)
+    cfg = kube.Configuration()
+    cfg.host = host
+    cfg.verify_ssl = True
+    api_client = kube.ApiClient(cfg)
+    _use_ssl_context(api_client, ssl_context)
+    return api_client, None
+
+
+# auth_method -> (ApiClient factory, check_connection success message).
+# Factories return (api_client, error) and may raise on malformed credentials.
+_AUTH_HANDLERS: Dict[str, Tuple[Any, str]] = {
+    "token": (_token_client, "Connected successfully (token)."),
+    "serviceAccount": (_token_client, "Connected successfully (token)."),
+    "kubeconfig": (_kubeconfig_client, "Connected via kubeconfig."),
+    "clientCert": (_client_cert_client, "Connected successfully (client certificate)."),
+}
 
 
 async def check_connection(
@@ -39,83 +207,43 @@ async def check_connection(
     You may pass a cluster model instance via `cluster` (preferred), or individual args.
     """
     if cluster is not None:
-        api_url = getattr(cluster, "api_url", None)
-        raw_method = getattr(cluster, "auth_method", None)
-        if raw_method is None:
-            auth_method = None
-        else:
-            auth_method = raw_method.value if hasattr(raw_method, "value") else str(raw_method)
-        token = decrypt_secret(getattr(cluster, "token", None))
-        kubeconfig_content = decrypt_secret(getattr(cluster, "kubeconfig_content", None))
-        client_key = decrypt_secret(getattr(cluster, "client_key", None))
-        client_cert = decrypt_secret(getattr(cluster, "client_cert", None))
-        client_ca = decrypt_secret(getattr(cluster, "client_ca_cert", None))
-
-    if K8sConfiguration is None:
+        credentials = cluster_credentials(cluster)
+    else:
+        credentials = dict(
+            api_url=api_url,
+            auth_method=auth_method,
+            token=token,
+            kubeconfig_content=kubeconfig_content,
+            client_key=client_key,
+            client_cert=client_cert,
+            client_ca=client_ca,
+        )
+
+    kube = load_kubernetes()
+    if kube is None:
         return False, "kubernetes python client not installed on server."
 
-    host = (api_url or "").strip()
+    host = (credentials["api_url"] or "").strip()
     if not host:
         return False, "Cluster API URL is not configured."
 
-    method = (auth_method or "").strip()
-    cfg = K8sConfiguration()
-    cfg.host = host
-    temp_files: List[str] = []
-    try:
-        if method in ("token", "serviceAccount"):
-            if not token:
-                return False, "Token is not configured."
-            cfg.api_key = {'authorization': token}
-            cfg.api_key_prefix = {'authorization': 'Bearer'}
-            with K8sApiClient(cfg) as api_client:  # type: ignore
-                api = K8sAuthenticationApi(api_client)  # type: ignore
-                api.get_api_group()
-                return True, "Connected successfully (token)."
-
-        if method == "kubeconfig":
-            if not kubeconfig_content:
-                return False, "Kubeconfig content is not configured."
-            try:
-                kc = yaml.safe_load(kubeconfig_content)
-                k8s_config.load_kube_config_from_dict(kc, persist_config=False)  # type: ignore
-                with K8sApiClient() as api_client:  # type: ignore
-                    api = K8sAuthenticationApi(api_client)  # type: ignore
-                    api.get_api_group()
-                    return True, "Connected via kubeconfig."
-            except Exception as e:
-                return False, f"Kubeconfig load/call failed: {e}"
-
-        if method == "clientCert":
-            if not (client_key and client_cert and client_ca):
-                return False, "Client key/cert/CA are required for clientCert."
-            # Persist to temp files
-            for content in (client_key, client_cert, client_ca):
-                tf = tempfile.NamedTemporaryFile(mode="w", delete=False)
-                tf.write(content)
-                tf.flush()
-                tf.close()
-                temp_files.append(tf.name)
-            cfg.cert_file = temp_files[1]
-            cfg.key_file = temp_files[0]
-            cfg.ssl_ca_cert = temp_files[2]
-            cfg.verify_ssl = True
-            with K8sApiClient(cfg) as api_client:  # type: ignore
-                api = K8sAuthenticationApi(api_client)  # type: ignore
-                api.get_api_group()
-                return True, "Connected successfully (client certificate)."
-
+    method = (credentials["auth_method"] or "").strip()
+    handler = _AUTH_HANDLERS.get(method)
+    if handler is None:
         return False, f"Unsupported auth method: {method}"
-    except K8sApiException as e:  # type: ignore
+    make_client, connected_message = handler
+    try:
+        api_client, err = make_client(host, credentials)
+        if err:
+            return False, err
+        with api_client:
+            api = kube.AuthenticationApi(api_client)
+            api.get_api_group()
+        return True, connected_message
+    except kube.ApiException as e:
         return False, f"Kubernetes API error: {e}"
     except Exception as e:
         return False, str(e)
-    finally:
-        for p in temp_files:
-            try:
-                os.remove(p)
-            except Exception:
-                pass
 
 
 def build_api_client(
@@ -127,95 +255,150 @@ def build_api_client(
     client_key: Optional[str] = None,
     client_cert: Optional[str] = None,
     client_ca: Optional[str] = None,
-) -> Tuple[Optional["K8sApiClient"], Optional[str]]:
+) -> Tuple[Optional[Any], Optional[str]]:
     """
     Build and return a configured Kubernetes ApiClient using the same credential logic
     as check_connection. Returns (api_client, error). On failure, api_client is None and
     error is a string.
     """
-    if K8sConfiguration is None or K8sApiClient is None:
+    if load_kubernetes() is None:
         return None, "kubernetes python client not installed on server."
 
-    host = (api_url or "").strip()
     method = (auth_method or "").strip()
-    temp_files: List[str] = []
-    try:
-        if method in ("token", "serviceAccount"):
-            if not host:
-                return None, "Cluster API URL is not configured."
-            if not token:
-                return None, "Token is not configured."
-            cfg = K8sConfiguration()
-            cfg.host = host
-            cfg.api_key = {'authorization': token}
-            cfg.api_key_prefix = {'authorization': 'Bearer'}
-            return K8sApiClient(cfg), None
-
-        if method == "kubeconfig":
-            if not kubeconfig_content:
-                return None, "Kubeconfig content is not configured."
-            try:
-                kc = yaml.safe_load(kubeconfig_content)
-                k8s_config.load_kube_config_from_dict(kc, persist_config=False)  # type: ignore
-                return K8sApiClient(), None  # type: ignore
-            except Exception as e:
-                return None, f"Kubeconfig load failed: {e}"
-
-        if method == "clientCert":
-            if not host:
-                return None, "Cluster API URL is not configured."
-            if not (client_key and client_cert and client_ca):
-                return None, "Client key/cert/CA are required for clientCert."
-            # Persist to temp files
-            for content in (client_key, client_cert, client_ca):
-                tf = tempfile.NamedTemporaryFile(mode="w", delete=False)
-                tf.write(content)
-                tf.flush()
-                tf.close()
-                temp_files.append(tf.name)
-            cfg = K8sConfiguration()
-            cfg.host = host
-            cfg.cert_file = temp_files[1]
-            cfg.key_file = temp_files[0]
-            cfg.ssl_ca_cert = temp_files[2]
-            cfg.verify_ssl = True
-            return K8sApiClient(cfg), None  # type: ignore
-
+    handler = _AUTH_HANDLERS.get(method)
+    if handler is None:
         if not method:
             return None, "Authentication method is not configured."
         return None, f"Unsupported auth method: {method}"
+    credentials = dict(
+        token=token,
+        kubeconfig_content=kubeconfig_content,
+        client_key=client_key,
+        client_cert=client_cert,
+        client_ca=client_ca,
+    )
+    try:
+        return handler[0]((api_url or "").strip(), credentials)
     except Exception as e:
         return None, str(e)
-    finally:
-        for p in temp_files:
-            try:
-                os.remove(p)
-            except Exception:
-                pass
 
 
-def build_api_client_from_cluster(cluster: Any) -> Tuple[Optional["K8sApiClient"], Optional[str]]:
+@functools.lru_cache(maxsize=512)
+def _decrypt_cached(ciphertext: Optional[str]) -> Optional[str]:
     """
-    Create an ApiClient from a cluster model instance with encrypted fields.
+    decrypt_secret memoized on the ciphertext. Fernet tokens are re-randomized on every
+    encrypt, so a rotated or edited secret is a new key and never served stale.
+    """
+    return decrypt_secret(ciphertext)
+
+
+def cluster_credentials(cluster: Any) -> Dict[str, Optional[str]]:
+    """
+    Decrypt a cluster model instance's connection fields into build_api_client keyword arguments.
     """
-    api_url = getattr(cluster, "api_url", None)
     raw_method = getattr(cluster, "auth_method", None)
     if raw_method is None:
         auth_method = None
     else:
         auth_method = raw_method.value if hasattr(raw_method, "value") else str(raw_method)
-    token = decrypt_secret(getattr(cluster, "token", None))
-    kubeconfig_content = decrypt_secret(getattr(cluster, "kubeconfig_content", None))
-    client_key = decrypt_secret(getattr(cluster, "client_key", None))
-    client_cert = decrypt_secret(getattr(cluster, "client_cert", None))
-    client_ca = decrypt_secret(getattr(cluster, "client_ca_cert", None))
-    return build_api_client(
-        api_url=api_url,
+    return dict(
+        api_url=getattr(cluster, "api_url", None),
         auth_method=auth_method,
-        token=token,
-        kubeconfig_content=kubeconfig_content,
-        client_key=client_key,
-        client_cert=client_cert,
-        client_ca=client_ca,
+        token=_decrypt_cached(getattr(cluster, "token", None)),
+        kubeconfig_content=_decrypt_cached(getattr(cluster, "kubeconfig_content", None)),
+        client_key=_decrypt_cached(getattr(cluster, "client_key", None)),
+        client_cert=_decrypt_cached(getattr(cluster, "client_cert", None)),
+        client_ca=_decrypt_cached(getattr(cluster, "client_ca_cert", None)),
     )
 
+
+def build_api_client_from_cluster(cluster: Any) -> Tuple[Optional[Any], Optional[str]]:
+    """
+    Create an ApiClient from a cluster model instance with encrypted fields.
+    """
+    return build_api_client(**cluster_credentials(cluster))
+
+
+# Process-wide ApiClients keyed by a digest of the cluster credentials, so repeated
+# operations on a cluster reuse its connection pool (no new TLS handshake) and whatever
+# callers cache per client in PooledApiClient.extras. Entries are replaced after
+# CLIENT_POOL_TTL_SECONDS and the least recently used is evicted past
+# CLIENT_POOL_MAX_ENTRIES; a client is only closed once it has left the pool and its
+# last user has released it. A credential change yields a new key, so the old client
+# simply ages out.
+CLIENT_POOL_TTL_SECONDS = 600
+CLIENT_POOL_MAX_ENTRIES = 32
+
+
+class PooledApiClient:
+    """A shared ApiClient handed out by acquire_api_client."""
+
+    def __init__(self, api_client: Any) -> None:
+        self.api_client = api_client
+        self.extras: Dict[str, Any] = {}  # per-client caches kept by callers
+        self.expires_at = time.monotonic() + CLIENT_POOL_TTL_SECONDS
+        self.users = 0
+        self.retired = False
+
+    def close(self) -> None:
+        try:
+            self.api_client.close()  # type: ignore[attr-defined]
+        except Exception:
+            pass
+
+
+_client_pool: "OrderedDict[bytes, PooledApiClient]" = OrderedDict()
+_client_pool_lock = threading.Lock()
+
+
+def _retire(pooled: PooledApiClient) -> None:
+    # Called with _client_pool_lock held
+    pooled.retired = True
+    if pooled.users == 0:
+        pooled.close()
+
+
+def acquire_api_client(cluster: Optional[Any], credentials: Dict[str, Any]) -> Tuple[Optional[PooledApiClient], Optional[str]]:
+    """
+    Return a pooled client for the cluster (or the explicit credentials) with a user
+    reference taken; pair every successful call with release_api_client. Returns (client, error).
+    """
+    if cluster is not None:
+        credentials = cluster_credentials(cluster)
+    key = hashlib.blake2b(
+        json.dumps(credentials, sort_keys=True, default=str).encode("utf-8"), digest_size=16
+    ).digest()
+    now = time.monotonic()
+    with _client_pool_lock:
+        pooled = _client_pool.get(key)
+        if pooled is not None and pooled.expires_at > now:
+            _client_pool.move_to_end(key)
+            pooled.users += 1
+            return pooled, None
+        if pooled is not None:
+            del _client_pool[key]
+            _retire(pooled)
+
+    api_client, err = build_api_client(**credentials)
+    if err:
+        return None, err
+    if api_client is None:
+        return None, "Failed to create Kubernetes client."
+
+    pooled = PooledApiClient(api_client)
+    pooled.users = 1
+    with _client_pool_lock:
+        replaced = _client_pool.pop(key, None)
+        if replaced is not None:
+            _retire(replaced)
+        _client_pool[key] = pooled
+        while len(_client_pool) > CLIENT_POOL_MAX_ENTRIES:
+            _retire(_client_pool.popitem(last=False)[1])
+    return pooled, None
+
+
+def release_api_client(pooled: PooledApiClient) -> None:
+    with _client_pool_lock:
+        pooled.users -= 1
+        if pooled.retired and pooled.users == 0:
+            pooled.close()
@@ -2,27 +2,111 @@
 Kubernetes API health utilities.
 """
 from __future__ import annotations
-from typing import Tuple
+from typing import Dict, List, Tuple
+import asyncio
+import functools
+import time
 import httpx
 
 
+# Shared clients keyed by verify_ssl (the timeout is applied per request), so repeated
+# probes reuse pooled keep-alive connections instead of a new client and TLS handshake
+# per call. Closed on application shutdown by close_readyz_clients.
+_readyz_clients: Dict[bool, httpx.AsyncClient] = {}
+
+
+def _readyz_client(verify_ssl: bool) -> httpx.AsyncClient:
+    client = _readyz_clients.get(verify_ssl)
+    if client is None or client.is_closed:
+        client = httpx.AsyncClient(
+            verify=verify_ssl,
+            limits=httpx.Limits(max_keepalive_connections=32),
+        )
+        _readyz_clients[verify_ssl] = client
+    return client
+
+
+# Recent probe results: (url, verify_ssl) -> (monotonic time, (ok, message)), reused for
+# READYZ_CACHE_TTL_SECONDS so dashboards polling the same cluster collapse into one
+# request; probes in progress are shared through _readyz_inflight (single flight).
+READYZ_CACHE_TTL_SECONDS = 2.0
+READYZ_CACHE_MAX_ENTRIES = 256
+_readyz_results: Dict[Tuple[str, bool], Tuple[float, Tuple[bool, str]]] = {}
+_readyz_inflight: Dict[Tuple[str, bool], "asyncio.Task[Tuple[bool, str]]"] = {}
+
+
+async def close_readyz_clients() -> None:
+    """Close the shared readyz clients (called on application shutdown)."""
+    clients = list(_readyz_clients.values())
+    _readyz_clients.clear()
+    for client in clients:
+        await client.aclose()
+
+
+async def _probe_readyz(url: str, timeout_seconds: float, verify_ssl: bool) -> Tuple[bool, str]:
+    try:
+        resp = await _readyz_client(verify_ssl).get(url, timeout=timeout_seconds)
+        # Compare raw bytes; the body is only decoded for the failure message
+        body = resp.content.strip()
+        if resp.status_code == 200 and (body == b"ok" or b"ok" in body.lower()):
+            return True, "ok"
+        return False, f"{resp.status_code}: {body.decode('utf-8', errors='replace')}"
+    except Exception as e:
+        return False, str(e)
+
+
+def _store_readyz_result(key: Tuple[str, bool], task: "asyncio.Task[Tuple[bool, str]]") -> None:
+    _readyz_inflight.pop(key, None)
+    if task.cancelled():
+        return
+    now = time.monotonic()
+    if len(_readyz_results) >= READYZ_CACHE_MAX_ENTRIES:
+        for stale in [k for k, (at, _) in _readyz_results.items() if now - at >= READYZ_CACHE_TTL_SECONDS]:
+            del _readyz_results[stale]
+    _readyz_results[key] = (now, task.result())
+
+
 async def check_readyz(api_url: str, *, timeout_seconds: float = 5.0, verify_ssl: bool = False) -> Tuple[bool, str]:
     """
     Check the unauthenticated /readyz endpoint and return (ok, message).
     - ok: True when HTTP 200 and body contains 'ok' (case-insensitive)
     - message: 'ok' on success, or '<status>: <body>' / exception string on failure
+    Results are reused for READYZ_CACHE_TTL_SECONDS, and concurrent callers for the
+    same URL share one in-flight request.
     """
     if not api_url:
         return False, "API URL is empty"
 
     url = api_url.rstrip("/") + "/readyz"
-    try:
-        async with httpx.AsyncClient(verify=verify_ssl, timeout=timeout_seconds) as client:
-            resp = await client.get(url)
-            text = (resp.text or "").strip()
-            if resp.status_code == 200 and "ok" in text.lower():
-                return True, "ok"
-            return False, f"{resp.status_code}: {text}"
-    except Exception as e:
-        return False, str(e)
+    key = (url, verify_ssl)
+    cached = _readyz_results.get(key)
+    if cached is not None and time.monotonic() - cached[0] < READYZ_CACHE_TTL_SECONDS:
+        return cached[1]
+
+    task = _readyz_inflight.get(key)
+    if task is None:
+        task = asyncio.ensure_future(_probe_readyz(url, timeout_seconds, verify_ssl))
+        _readyz_inflight[key] = task
+        task.add_done_callback(functools.partial(_store_readyz_result, key))
+    # A cancelled caller must not cancel the probe other callers are waiting on
+    return await asyncio.shield(task)
+
+
+async def check_readyz_many(
+    api_urls: List[str],
+    *,
+    timeout_seconds: float = 5.0,
+    verify_ssl: bool = False,
+    concurrency: int = 32,
+) -> List[Tuple[bool, str]]:
+    """
+    check_readyz for several clusters at once; results are returned in input order.
+    At most `concurrency` probes run at a time, all over the shared client.
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def probe(api_url: str) -> Tuple[bool, str]:
+        async with semaphore:
+            return await check_readyz(api_url, timeout_seconds=timeout_seconds, verify_ssl=verify_ssl)
 
+    return list(await asyncio.gather(*(probe(api_url) for api_url in api_urls)))
@@ -1,23 +1,41 @@
 from __future__ import annotations
-from typing import Any, Dict, List, Mapping, Optional, Literal
+from typing import Any, Dict, List, Mapping, Optional, Literal, Tuple
+from collections import defaultdict
+import functools
+import types
+from dataclasses import dataclass, field
 from app.core.config import settings
+try:
+    from orjson import loads as _json_loads  # optional, faster listener parsing
+except ImportError:  # pragma: no cover - orjson optional
+    from json import loads as _json_loads
 
+# Shared stand-in for a missing config mapping, so lookups need no fresh empty dict
+_EMPTY_MAP: Mapping[str, Any] = types.MappingProxyType({})
 
+# "/", "_" and " " all become "-" in one pass (see _normalize_name)
+_NORMALIZE_TABLE = str.maketrans("/_ ", "---")
+
+
+# Project, service and environment names repeat across every manifest of a render,
+# so both name helpers are memoized (they are pure functions of their str argument)
+@functools.lru_cache(maxsize=2048)
 def _normalize_name(name: str) -> str:
     """
     Normalize a resource name to be close to DNS‑1123 compliant by replacing
     common invalid characters.
     """
-    return name.lower().replace("/", "-").replace("_", "-").replace(" ", "-")
+    return name.lower().translate(_NORMALIZE_TABLE)
 
-def _get_namespace_name(service_details: dict) -> str:
-    project_id = _normalize_name(service_details["project"]["id"])
+@functools.lru_cache(maxsize=2048)
+def _get_namespace_name(project_id: str) -> str:
+    """Namespace for a project, given its already normalized id."""
     return f"proj-{project_id}"
 
 def render_namespace_manifest(service_details: dict) -> dict:
     project_id = _normalize_name(service_details["project"]["id"])
     project_name = _normalize_name(service_details["project"]["name"])
-    ns_name = _get_namespace_name(service_details)
+    ns_name = _get_namespace_name(project_id)
     return {
         "apiVersion": "v1",
         "kind": "Namespace",
@@ -30,84 +48,128 @@ def render_namespace_manifest(service_details: dict) -> dict:
         },
     }
 
-def _build_labels(scope: Literal["namespace", "deployment", "pod", "service", "service_account"], service_details: dict, version_label: Optional[str] = None, deployment_id: Optional[str] = None, extra: Optional[Mapping[str, str]] = None) -> Dict[str, str]:
+
+# Kubernetes standard labels carried by every manifest env360 renders (copied, never mutated)
+_BASE_LABELS: Dict[str, str] = {
+    "app.kubernetes.io/part-of": "env360",
+    "app.kubernetes.io/managed-by": "env360",
+}
+
+# Scopes whose labels identify a service version (see _build_labels)
+_LABELED_SCOPES = frozenset({"deployment", "pod", "service", "service_account"})
+
+
+def _build_labels(scope: Literal["namespace", "deployment", "pod", "service", "service_account"], ctx: _RenderCtx, extra: Optional[Mapping[str, str]] = None) -> Dict[str, str]:
     """
     Standardized set of labels for Namespaces/Deployments/Pods/Services.
     """
-    labels: Dict[str, str] = {
-          # Kubernetes standard        
-        "app.kubernetes.io/part-of": "env360",
-        "app.kubernetes.io/managed-by": "env360",
-        "project-id": service_details["project"]["id"],
-        "project-name": service_details["project"]["name"],
-        "deployment-id": deployment_id,
-    }
-    
-    # Deployment labels
-    if scope in ["deployment", "pod", "service", "service_account"]:
+    labels: Dict[str, str] = dict(_BASE_LABELS)
+    labels["project-id"] = ctx.proj_id
+    labels["project-name"] = ctx.proj_name
+    labels["deployment-id"] = ctx.deployment_id
+
+    # Deployment labels: a superset of the selector labels
+    if scope in _LABELED_SCOPES:
+        labels.update(ctx.selector_labels)
+        version_label = ctx.version_label
+        app_label = f"{ctx.svc_name}-{version_label}"
         labels.update({
-            "app.kubernetes.io/name": f'{service_details["service"]["name"]}-{version_label}',
-            "app.kubernetes.io/instance": f"{service_details['service']['id']}-{version_label}",
+            "app.kubernetes.io/name": app_label,
+            "app.kubernetes.io/instance": f"{ctx.svc_id}-{version_label}",
             "app.kubernetes.io/version": version_label,
-            "app": f'{service_details["service"]["name"]}-{version_label}',
-            "version": version_label,
-            "service-id": service_details["service"]["id"],
-            "service-name": service_details["service"]["name"],
+            "app": app_label,
         })
         # Lane label for Istio source-based routing
-        lane_id = service_details.get("lane_id") or service_details.get("config", {}).get("lane_id")
+        lane_id = ctx.service_details.get("lane_id") or ctx.config.get("lane_id")
         if lane_id:
             labels["lane"] = str(lane_id)
-    
-    # if scope == "pod":
-    #     labels.update({
-    #         "app.kubernetes.io/name": f'{service_details["service"]["name"]}-{version_label}',
-    #         "app.kubernetes.io/instance": f"{service_details['service']['id']}-{version_label}",
-    #         "app.kubernetes.io/version": version_label,
-    #         "app": f'{service_details["service"]["name"]}-{version_label}',
-    #         "version": version_label,
-    #         "service-id": service_details["service"]["id"],
-    #         "service-name": service_details["service"]["name"],
-    #     })
-    
-    # if scope == "service":
-    #     labels.update({
-    #         "app.kubernetes.io/name": f'{service_details["service"]["name"]}-{version_label}',
-    #         "app.kubernetes.io/instance": f"{service_details['service']['id']}-{version_label}",
-    #         "app.kubernetes.io/version": version_label,
-    #         "app": f'{service_details["service"]["name"]}-{version_label}',
-    #         "version": version_label,
-    #         "service-id": service_details["service"]["id"],
-    #         "service-name": service_details["service"]["name"],
-    #     })
-
-    
+
     if extra:
         labels.update(dict(extra))
     return labels
 
 
-def _build_deployment_metadata(service_details: dict, version_label: str, deployment_id: str) -> Dict[str, Any]:
+@dataclass(frozen=True, slots=True)
+class _RenderCtx:
+    """
+    Identity of the service version being rendered, derived once per render_* call
+    and threaded through the builders instead of re-reading service_details.
+    """
+    service_details: dict
+    config: Mapping[str, Any]
+    version_label: str
+    deployment_id: Optional[str]
+    svc_id: str
+    svc_name: str  # as given; used in label values
+    svc_name_norm: str
+    proj_id: str
+    proj_name: str  # as given; used in label values
+    proj_name_norm: str
+    ns_name: str
+    versioned_name: str  # "<service>-<version>": Deployment, Service and backend host name
+    sa_name: str
+    # Pod selector shared (never mutated) by the Deployment and Service manifests
+    selector_labels: Dict[str, str]
+    # "service" scope labels, shared (never mutated) by every manifest of the call
+    service_labels: Dict[str, str] = field(init=False)
+
+    def __post_init__(self) -> None:
+        object.__setattr__(self, "service_labels", _build_labels("service", self))
+
+    @classmethod
+    def from_service(cls, service_details: dict, version_label: str, deployment_id: Optional[str] = None) -> "_RenderCtx":
+        service = service_details["service"]
+        project = service_details["project"]
+        svc_name_norm = _normalize_name(service["name"])
+        proj_id_norm = _normalize_name(project["id"])
+        versioned_name = f"{svc_name_norm}-{version_label}"
+        return cls(
+            service_details=service_details,
+            config=service_details.get("config") or _EMPTY_MAP,
+            version_label=version_label,
+            deployment_id=deployment_id,
+            svc_id=service["id"],
+            svc_name=service["name"],
+            svc_name_norm=svc_name_norm,
+            proj_id=project["id"],
+            proj_name=project["name"],
+            proj_name_norm=_normalize_name(project["name"]),
+            ns_name=_get_namespace_name(proj_id_norm),
+            versioned_name=versioned_name,
+            sa_name=versioned_name + "-account",
+            selector_labels={
+                "service-id": service["id"],
+                "service-name": service["name"],
+                "version": version_label,
+                "project-id": project["id"],
+                "project-name": project["name"],
+            },
+        )
+
+    def labels(self, scope: Literal["namespace", "deployment", "pod", "service", "service_account"]) -> Dict[str, str]:
+        return _build_labels(scope, self)
+
+
+def _build_deployment_metadata(ctx: _RenderCtx) -> Dict[str, Any]:
     """
     Build Kubernetes object metadata.
     """
     return {
-        "name": f"{_normalize_name(service_details['service']['name'])}-{version_label}",
-        "namespace": _get_namespace_name(service_details),
-        "labels": _build_labels("deployment", service_details, version_label, deployment_id),
+        "name": ctx.versioned_name,
+        "namespace": ctx.ns_name,
+        "labels": ctx.labels("deployment"),
         # "annotations": service_details.get("config", {}).get("annotations", {}),
     }
 
-def _build_container_spec(service_details: dict, version_label: str) -> Dict[str, Any]:
+def _build_container_spec(ctx: _RenderCtx) -> Dict[str, Any]:
     """
     Build a container spec with sensible defaults suitable for production.
     """
-    config = service_details.get("config", {})
-    service_name = _normalize_name(service_details.get("service", {}).get("name", "app"))
+    config = ctx.config
     image = config.get("docker_image") or config.get("image") or ""
 
     spec: Dict[str, Any] = {
-        "name": f"{service_name}",
+        "name": ctx.svc_name_norm,
         "image": image,
         "imagePullPolicy": config.get("imagePullPolicy", "IfNotPresent"),
     }
@@ -148,17 +210,17 @@ def _build_container_spec(service_details: dict, version_label: str) -> Dict[str
     return spec
 
 
-def _build_pod_spec(service_details: dict, version_label: str) -> Dict[str, Any]:
+def _build_pod_spec(ctx: _RenderCtx) -> Dict[str, Any]:
     """
     Build a Pod spec with common production fields.
     """
-    config = service_details.get("config", {})
+    config = ctx.config
     spec: Dict[str, Any] = {
-        "containers": [_build_container_spec(service_details, version_label)],
+        "containers": [_build_container_spec(ctx)],
         "dnsPolicy": config.get("dnsPolicy", "ClusterFirst"),
         "restartPolicy": config.get("restartPolicy", "Always"),
-        "serviceAccount": f"{_normalize_name(service_details['service']['name'])}-{version_label}-account",
-        "serviceAccountName": f"{_normalize_name(service_details['service']['name'])}-{version_label}-account",
+        "serviceAccount": ctx.sa_name,
+        "serviceAccountName": ctx.sa_name,
         "terminationGracePeriodSeconds": config.get("terminationGracePeriodSeconds", 30),
         "securityContext": {}, # TODO: Add security context
         "volumes": [] # TODO: Add volumes
@@ -166,11 +228,11 @@ def _build_pod_spec(service_details: dict, version_label: str) -> Dict[str, Any]
     return spec
 
 
-def _build_deployment_spec(service_details: dict, version_label: str, deployment_id: str) -> Dict[str, Any]:
+def _build_deployment_spec(ctx: _RenderCtx) -> Dict[str, Any]:
     """
     Build a Deployment spec with rolling update strategy.
     """
-    config = service_details.get("config", {})
+    config = ctx.config
     spec: Dict[str, Any] = {
         "replicas": config.get("replicas", 1),
         "revisionHistoryLimit": config.get("revisionHistoryLimit", 10),
@@ -182,18 +244,10 @@ def _build_deployment_spec(service_details: dict, version_label: str, deployment
                 "maxSurge": config.get("rollingUpdate_maxSurge", 1),
             },
         },
-        "selector": {
-            "matchLabels": {
-                "service-id": service_details["service"]["id"],
-                "service-name": service_details["service"]["name"],
-                "version": version_label,
-                "project-id": service_details["project"]["id"],
-                "project-name": service_details["project"]["name"],
-            }
-        },
+        "selector": {"matchLabels": ctx.selector_labels},
         "template": {
-            "metadata": _build_deployment_metadata(service_details, version_label, deployment_id),
-            "spec": _build_pod_spec(service_details, version_label),
+            "metadata": _build_deployment_metadata(ctx),
+            "spec": _build_pod_spec(ctx),
         },
     }
     return spec
@@ -207,11 +261,12 @@ def render_deployment_yaml(
     """
     Build a production‑grade Kubernetes Deployment manifest (as a dict) in a modular way.
     """
+    ctx = _RenderCtx.from_service(service_details, version_label, deployment_id)
     manifest: Dict[str, Any] = {
         "apiVersion": "apps/v1",
         "kind": "Deployment",
-        "metadata": _build_deployment_metadata(service_details, version_label, deployment_id),
-        "spec": _build_deployment_spec(service_details, version_label, deployment_id),
+        "metadata": _build_deployment_metadata(ctx),
+        "spec": _build_deployment_spec(ctx),
     }
     return manifest
 
@@ -220,87 +275,92 @@ def render_service_yaml(service_details: dict, version_label: str, deployment_id
     """
     Build a Kubernetes Service manifest that routes traffic to the matching pods.
     """
-    config = service_details.get("config", {})
-    svc_name = _normalize_name(service_details["service"]["name"])
-    namespace = _get_namespace_name(service_details)
+    ctx = _RenderCtx.from_service(service_details, version_label, deployment_id)
+    config = ctx.config
 
     # Derive ports from config; default to port 80 -> targetPort 80
-    configured_ports = config.get("ports", [])
+    configured_ports = config.get("ports") or ()
     svc_ports: List[Dict[str, Any]] = []
     for p in configured_ports:
         if isinstance(p, dict):
+            container_port = p.get("containerPort", 80)
             svc_ports.append({
-                "name": p.get("name", f"port-{p.get('containerPort', 80)}"),
-                "port": p.get("containerPort", 80),
-                "targetPort": p.get("containerPort", 80),
+                # The default name is only formatted when the port has none
+                "name": p["name"] if "name" in p else f"port-{container_port}",
+                "port": container_port,
+                "targetPort": container_port,
                 "protocol": p.get("protocol", "TCP"),
             })
     if not svc_ports:
         svc_ports = [{"name": "http", "port": 80, "targetPort": 80, "protocol": "TCP"}]
 
-    selector_labels = {
-        "service-id": service_details["service"]["id"],
-        "service-name": service_details["service"]["name"],
-        "version": version_label,
-        "project-id": service_details["project"]["id"],
-        "project-name": service_details["project"]["name"],
-    }
-
     manifest: Dict[str, Any] = {
         "apiVersion": "v1",
         "kind": "Service",
         "metadata": {
-            "name": f"{svc_name}-{version_label}",
-            "namespace": namespace,
-            "labels": _build_labels("service", service_details, version_label, deployment_id),
+            "name": ctx.versioned_name,
+            "namespace": ctx.ns_name,
+            "labels": ctx.service_labels,
         },
         "spec": {
             "type": config.get("serviceType", "ClusterIP"),
-            "selector": selector_labels,
+            "selector": ctx.selector_labels,
             "ports": svc_ports,
         },
     }
     return manifest
 
 
-def render_route_yaml(service_details: dict, version_label: str, deployment_id: str, env_name: str = "") -> Dict[str, Any]:
+def _compute_external_route(ctx: _RenderCtx, env_name: str) -> Tuple[str, str, int, str, str]:
     """
-    Build a Gateway API HTTPRoute manifest that routes traffic to the
-    Kubernetes Service created for this service version.
+    Ingress routing shared by the HTTPRoute and external VirtualService renderers.
+    Returns (base_domain, route_prefix, backend_port, gateway_name, gateway_namespace);
+    the backend is the Service named ctx.versioned_name.
     """
-    config = service_details.get("config", {})
-    svc_name = _normalize_name(service_details["service"]["name"])
-    namespace = _get_namespace_name(service_details)
-    project_name = _normalize_name(service_details["project"]["name"])
+    config = ctx.config
     env_segment = _normalize_name(env_name) if env_name else ""
 
     # Path-based routing: <base_domain>/<project>/<env>/<service>/<version>
     base_domain = config.get("base_domain") or settings.BASE_DOMAIN
-    route_prefix = f"/{project_name}/{env_segment}/{svc_name}/{version_label}" if env_segment else f"/{project_name}/{svc_name}/{version_label}"
-
-    # Backend service name matches the Service manifest name
-    backend_svc_name = f"{svc_name}-{version_label}"
+    route_prefix = (
+        f"/{ctx.proj_name_norm}/{env_segment}/{ctx.svc_name_norm}/{ctx.version_label}"
+        if env_segment
+        else f"/{ctx.proj_name_norm}/{ctx.svc_name_norm}/{ctx.version_label}"
+    )
 
     # Derive first port from config; default to 80
-    configured_ports = config.get("ports", [])
+    configured_ports = config.get("ports") or ()
     backend_port = 80
     if configured_ports and isinstance(configured_ports[0], dict):
         backend_port = configured_ports[0].get("containerPort", 80)
 
+    gateway_name = config.get("gateway_name", "env360-ingress")
+    gateway_namespace = config.get("gateway_namespace", "istio-ingress")
+    return base_domain, route_prefix, backend_port, gateway_name, gateway_namespace
+
+
+def render_route_yaml(service_details: dict, version_label: str, deployment_id: str, env_name: str = "") -> Dict[str, Any]:
+    """
+    Build a Gateway API HTTPRoute manifest that routes traffic to the
+    Kubernetes Service created for this service version.
+    """
+    ctx = _RenderCtx.from_service(service_details, version_label, deployment_id)
+    base_domain, route_prefix, backend_port, gateway_name, gateway_namespace = _compute_external_route(ctx, env_name)
+
     manifest: Dict[str, Any] = {
         "apiVersion": "gateway.networking.k8s.io/v1",
         "kind": "HTTPRoute",
         "metadata": {
-            "name": f"{svc_name}-{version_label}-route",
-            "namespace": namespace,
-            "labels": _build_labels("service", service_details, version_label, deployment_id),
+            "name": f"{ctx.versioned_name}-route",
+            "namespace": ctx.ns_name,
+            "labels": ctx.service_labels,
         },
         "spec": {
             "hostnames": [base_domain],
             "parentRefs": [
                 {
-                    "name": config.get("gateway_name", "env360-ingress"),
-                    "namespace": config.get("gateway_namespace", "istio-ingress"),
+                    "name": gateway_name,
+                    "namespace": gateway_namespace,
                 }
             ],
             "rules": [
@@ -315,7 +375,7 @@ def render_route_yaml(service_details: dict, version_label: str, deployment_id:
                     ],
                     "backendRefs": [
                         {
-                            "name": backend_svc_name,
+                            "name": ctx.versioned_name,
                             "port": backend_port,
                         }
                     ],
@@ -330,13 +390,14 @@ def render_service_account_yaml(service_details: dict, version_label: str, deplo
     """
     Build a Service Account manifest.
     """
+    ctx = _RenderCtx.from_service(service_details, version_label, deployment_id)
     manifest: Dict[str, Any] = {
         "apiVersion": "v1",
         "kind": "ServiceAccount",
         "metadata":  {
-            "name": f"{_normalize_name(service_details['service']['name'])}-{version_label}-account",
-            "namespace": _get_namespace_name(service_details),
-            "labels": _build_labels("service_account", service_details, version_label, deployment_id),
+            "name": ctx.sa_name,
+            "namespace": ctx.ns_name,
+            "labels": ctx.labels("service_account"),
         }        
     }
     return manifest
@@ -362,35 +423,36 @@ def render_destination_rule(
 
     Returns a **list** of DestinationRule manifests (one per unique host).
     """
-    namespace = _get_namespace_name(service_details)
-    svc_name = _normalize_name(service_details["service"]["name"])
+    ctx = _RenderCtx.from_service(service_details, version_label, deployment_id)
+    svc_name = ctx.svc_name_norm
 
     # Collect host → set-of-versions mapping
-    host_versions: Dict[str, set] = {}
+    host_versions: Dict[str, set] = defaultdict(set)
 
     # The current service itself
-    host_versions.setdefault(svc_name, set()).add(version_label)
+    host_versions[svc_name].add(version_label)
 
     # Downstream services
-    for ds in (downstream_overrides or []):
+    for ds in (downstream_overrides or ()):
         ds_host = _normalize_name(ds.get("serviceName", ""))
         ds_ver = ds.get("version", "")
         if ds_host and ds_ver:
-            host_versions.setdefault(ds_host, set()).add(ds_ver)
+            host_versions[ds_host].add(ds_ver)
 
     manifests: List[Dict[str, Any]] = []
     for host, versions in host_versions.items():
+        # Most hosts have a single version, which needs no sorting
         subsets = [
             {"name": v, "labels": {"version": v}}
-            for v in sorted(versions)
+            for v in (versions if len(versions) == 1 else sorted(versions))
         ]
         manifests.append({
             "apiVersion": "networking.istio.io/v1beta1",
             "kind": "DestinationRule",
             "metadata": {
                 "name": f"{host}-dest-rule",
-                "namespace": namespace,
-                "labels": _build_labels("service", service_details, version_label, deployment_id),
+                "namespace": ctx.ns_name,
+                "labels": ctx.service_labels,
             },
             "spec": {
                 "host": host,
@@ -419,11 +481,11 @@ def render_virtual_service_source_dest(
     if not downstream_overrides:
         return []
 
-    namespace = _get_namespace_name(service_details)
-    svc_name = _normalize_name(service_details["service"]["name"])
+    ctx = _RenderCtx.from_service(service_details, version_label, deployment_id)
+    svc_name = ctx.svc_name_norm
 
     source_labels: Dict[str, str] = {
-        "app": f"{svc_name}-{version_label}",
+        "app": ctx.versioned_name,
         "version": version_label,
     }
     if lane_id:
@@ -441,8 +503,8 @@ def render_virtual_service_source_dest(
             "kind": "VirtualService",
             "metadata": {
                 "name": f"{svc_name}-to-{ds_host}-{version_label}",
-                "namespace": namespace,
-                "labels": _build_labels("service", service_details, version_label, deployment_id),
+                "namespace": ctx.ns_name,
+                "labels": ctx.service_labels,
             },
             "spec": {
                 "hosts": [ds_host],
@@ -481,38 +543,16 @@ def render_virtual_service_external(
 
     Route pattern: ``/<project>/<env>/<service>/<version>``
     """
-    config = service_details.get("config", {})
-    svc_name = _normalize_name(service_details["service"]["name"])
-    namespace = _get_namespace_name(service_details)
-    project_name = _normalize_name(service_details["project"]["name"])
-    env_segment = _normalize_name(env_name) if env_name else ""
-
-    base_domain = config.get("base_domain") or settings.BASE_DOMAIN
-    route_prefix = (
-        f"/{project_name}/{env_segment}/{svc_name}/{version_label}"
-        if env_segment
-        else f"/{project_name}/{svc_name}/{version_label}"
-    )
-
-    # Backend service name matches the K8s Service manifest name
-    backend_svc_name = f"{svc_name}-{version_label}"
-
-    # Derive first port from config; default to 80
-    configured_ports = config.get("ports", [])
-    backend_port = 80
-    if configured_ports and isinstance(configured_ports[0], dict):
-        backend_port = configured_ports[0].get("containerPort", 80)
-
-    gateway_name = config.get("gateway_name", "env360-ingress")
-    gateway_namespace = config.get("gateway_namespace", "istio-ingress")
+    ctx = _RenderCtx.from_service(service_details, version_label, deployment_id)
+    base_domain, route_prefix, backend_port, gateway_name, gateway_namespace = _compute_external_route(ctx, env_name)
 
     manifest: Dict[str, Any] = {
         "apiVersion": "networking.istio.io/v1beta1",
         "kind": "VirtualService",
         "metadata": {
-            "name": f"{svc_name}-{version_label}-ext-vs",
-            "namespace": namespace,
-            "labels": _build_labels("service", service_details, version_label, deployment_id),
+            "name": f"{ctx.versioned_name}-ext-vs",
+            "namespace": ctx.ns_name,
+            "labels": ctx.service_labels,
         },
         "spec": {
             "hosts": [base_domain],
@@ -529,7 +569,7 @@ def render_virtual_service_external(
                     "route": [
                         {
                             "destination": {
-                                "host": backend_svc_name,
+                                "host": ctx.versioned_name,
                                 "port": {"number": backend_port},
                             }
                         }
@@ -573,8 +613,7 @@ def render_certificate_manifest(
             "name": cert_name,
             "namespace": cert_namespace,
             "labels": {
-                "app.kubernetes.io/part-of": "env360",
-                "app.kubernetes.io/managed-by": "env360",
+                **_BASE_LABELS,
                 "environment-name": env_seg,
                 "project-name": proj_seg,
             },
@@ -616,49 +655,43 @@ def render_gateway_manifest(
     cert_namespace = settings.DOMAIN_CERT_NAMESPACE    
     listeners_spec = []
     for listener in listeners:
-        val = listener.get('value', '{}')
-        if isinstance(val, str):
-            import json
-            val = json.loads(val)
+        # Rows may carry the value as JSON text or already parsed
+        val = listener.get('value')
+        if isinstance(val, (str, bytes)):
+            val = _json_loads(val) if val else {}
+        elif val is None:
+            val = {}
         env_seg = _normalize_name(val.get('environment_name', ''))
         proj_seg = _normalize_name(val.get('project_name', ''))
         domain = f'{env_name}.{project_name}.{settings.BASE_DOMAIN}'        
         cert_name = f"{env_seg}-{proj_seg}-cert"
+        # The domain and path listeners differ only in name and hostname, so they
+        # share the allowedRoutes and tls blocks
+        allowed_routes = {"namespaces": {"from": "All"}}
+        tls = {
+            "mode": "Terminate",
+            "certificateRefs": [
+                {
+                    "name": cert_name,
+                    "namespace": cert_namespace,
+                }
+            ],
+        }
         listeners_spec.append({
             "name": f"http-{proj_seg}-{env_seg}-domain",
             "port": 443,
             "protocol": "HTTPS",
             "hostname": f"*.{domain}",
-            "allowedRoutes": {
-                "namespaces": {"from": "All"},
-            },
-            "tls": {
-                "mode": "Terminate",
-                "certificateRefs": [
-                    {
-                        "name": cert_name,
-                        "namespace": cert_namespace,
-                    }
-                ],
-            },
+            "allowedRoutes": allowed_routes,
+            "tls": tls,
         })
         listeners_spec.append({
             "name": f"http-{proj_seg}-{env_seg}-path",
             "port": 443,
             "protocol": "HTTPS",
             "hostname": domain,
-            "allowedRoutes": {
-                "namespaces": {"from": "All"},
-            },
-            "tls": {
-                "mode": "Terminate",
-                "certificateRefs": [
-                    {
-                        "name": cert_name,
-                        "namespace": cert_namespace,
-                    }
-                ],
-            },
+            "allowedRoutes": allowed_routes,
+            "tls": tls,
         })
 
     return {
@@ -667,10 +700,7 @@ def render_gateway_manifest(
         "metadata": {
             "name": gateway_name,
             "namespace": gateway_namespace,
-            "labels": {
-                "app.kubernetes.io/part-of": "env360",
-                "app.kubernetes.io/managed-by": "env360",                
-            },
+            "labels": dict(_BASE_LABELS),
             "annotations": {
                 "tailscale.com/expose": "true",
             },
@@ -680,4 +710,3 @@ def render_gateway_manifest(
             "listeners": listeners_spec,
         },
     }
-    return manifest 
@@ -7,7 +7,8 @@ from fastapi.responses import RedirectResponse, JSONResponse
 from starlette.middleware.base import BaseHTTPMiddleware
 from starlette.types import ASGIApp
 import logging
-from urllib.parse import urlencode, quote
+import re
+from urllib.parse import quote
 
 logger = logging.getLogger(__name__)
 
@@ -19,7 +20,7 @@ class OpenIDAuthMiddleware(BaseHTTPMiddleware):
     """
     
     # Paths that don't require authentication
-    PUBLIC_PATHS = [
+    PUBLIC_PATHS = (
         "/health",
         "/docs",
         "/redoc",
@@ -27,19 +28,22 @@ class OpenIDAuthMiddleware(BaseHTTPMiddleware):
         "/api/v1/auth/login",
         "/api/v1/auth/callback",
         "/api/v1/auth/logout",
-    ]
+    )
+    # One anchored match per request; a public path must end there or continue with "/"
+    _PUBLIC_RE = re.compile(r"^(?:%s)(?:/|$)" % "|".join(map(re.escape, PUBLIC_PATHS)))
     
     def __init__(self, app: ASGIApp, oauth_login_url: str = "/api/v1/auth/login"):
         super().__init__(app)
         self.oauth_login_url = oauth_login_url
+        self._public_match = self._PUBLIC_RE.match
     
     async def dispatch(self, request: Request, call_next: Callable):
         # Check if path requires authentication
         path = request.url.path
         
         # Skip authentication for public paths
-        if any(path.startswith(public_path) for public_path in self.PUBLIC_PATHS):
-            logger.debug(f"Skipping auth check for public path: {path}")
+        if self._public_match(path):
+            logger.debug("Skipping auth check for public path: %s", path)
             return await call_next(request)
         
         # Check for authentication token in cookie (primary method)
@@ -49,38 +53,37 @@ class OpenIDAuthMiddleware(BaseHTTPMiddleware):
         # Fallback: Check Authorization header (for API clients)
         if not has_token:
             auth_header = request.headers.get("authorization")
-            has_token = auth_header and (
-                auth_header.startswith("Bearer ") or 
-                auth_header.startswith("bearer ")
-            )
+            has_token = bool(auth_header and auth_header.startswith(("Bearer ", "bearer ")))
         
         # If no token and path requires auth, redirect to OAuth login
         if not has_token:
-            accept_header = request.headers.get("accept", "").lower()
-            content_type = request.headers.get("content-type", "").lower()
+            # For API requests (JSON/GraphQL POST requests), return 401 with redirect info.
+            # Accept decides the common case; Content-Type is only read when it does not.
+            # MIME tokens are sent in canonical lowercase, so the values are not lowercased.
+            accept_header = request.headers.get("accept", "")
+            is_api_request = "application/json" in accept_header or "application/graphql" in accept_header
+            if not is_api_request:
+                content_type = request.headers.get("content-type", "")
+                is_api_request = (
+                    "application/graphql" in content_type or
+                    (request.method == "POST" and "/graphql" in path)  # GraphQL queries are typically POST
+                )
             
-            # For API requests (JSON/GraphQL POST requests), return 401 with redirect info
-            is_api_request = (
-                "application/json" in accept_header or
-                "application/graphql" in accept_header or
-                "application/graphql" in content_type or
-                (request.method == "POST" and "/graphql" in path)  # GraphQL queries are typically POST
-            )
+            # Both responses point at the same login URL; the request URL is serialized once
+            login_url = f"{self.oauth_login_url}?redirect_uri={quote(str(request.url), safe='')}"
             
             if is_api_request:
                 return JSONResponse(
                     status_code=status.HTTP_401_UNAUTHORIZED,
                     content={
                         "detail": "Authentication required",
-                        "auth_url": f"{self.oauth_login_url}?{urlencode({'redirect_uri': str(request.url)})}",
+                        "auth_url": login_url,
                     },
                     headers={"WWW-Authenticate": "Bearer"},
                 )
             
             # For browser requests (GET requests, including GraphQL playground), redirect to OAuth login
-            redirect_uri = quote(str(request.url), safe="")
-            login_url = f"{self.oauth_login_url}?redirect_uri={redirect_uri}"
-            logger.info(f"Redirecting unauthenticated {request.method} request to {path} -> {login_url}")
+            logger.info("Redirecting unauthenticated %s request to %s -> %s", request.method, path, login_url)
             return RedirectResponse(url=login_url, status_code=status.HTTP_302_FOUND)
         
         # Continue with authenticated request
@@ -0,0 +1,65 @@
+"""
+Schema probes shared by the Alembic revisions in alembic/versions.
+
+Kept outside alembic/versions because Alembic loads every module there as a revision.
+"""
+from typing import Optional
+import functools
+import sqlalchemy as sa
+from alembic import op
+
+
+def missing(kind: str, name: str, bind: Optional[sa.engine.Connection] = None) -> bool:
+    """
+    Return True when a schema object is absent, so a revision can skip work that an
+    earlier (partial) run already did.
+
+    kind is "table", "index" or "column"; columns are named "table.column".
+    On PostgreSQL this is a single pg_catalog lookup, elsewhere it uses reflection.
+    """
+    bind = bind if bind is not None else op.get_bind()
+    if kind not in ("table", "index", "column"):
+        raise ValueError(f"Unknown schema object kind: {kind}")
+
+    if bind.dialect.name == "postgresql":
+        if kind == "column":
+            table_name, column_name = name.split(".", 1)
+            result = bind.execute(sa.text("""
+                SELECT NOT EXISTS (
+                    SELECT 1 FROM pg_attribute
+                    WHERE attrelid = to_regclass(:qualname)
+                    AND attname = :col
+                    AND NOT attisdropped
+                )
+            """), {"qualname": f"public.{table_name}", "col": column_name})
+        else:
+            result = bind.execute(
+                sa.text("SELECT to_regclass(:qualname) IS NULL"),
+                {"qualname": f"public.{name}"},
+            )
+        return bool(result.scalar())
+
+    inspector = sa.inspect(bind)
+    if kind == "table":
+        return not inspector.has_table(name)
+    if kind == "column":
+        table_name, column_name = name.split(".", 1)
+        if not inspector.has_table(table_name):
+            return True
+        return column_name not in {col["name"] for col in inspector.get_columns(table_name)}
+    return not any(
+        ix["name"] == name
+        for table_name in inspector.get_table_names()
+        for ix in inspector.get_indexes(table_name)
+    )
+
+
+@functools.lru_cache(maxsize=1024)
+def table_exists(bind_id: int, table_name: str) -> bool:
+    """
+    Cached table probe keyed on (id(op.get_bind()), table_name).
+
+    Revisions call table_exists.cache_clear() once their upgrade/downgrade finishes so
+    tables they created or dropped are never reported stale to later revisions.
+    """
+    return not missing("table", table_name)
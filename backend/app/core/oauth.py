@@ -1,46 +1,148 @@
 """
 OAuth/SSO authentication utilities with OpenID Connect discovery
 """
-from typing import Optional, Dict, List
+from typing import Optional, Dict, List, Tuple
+import asyncio
+import base64
+import hashlib
+import hmac
+import json
+import secrets
+import time
 import httpx
 import logging
 from app.core.config import settings
 
 logger = logging.getLogger(__name__)
 
-# Cache for OpenID Connect discovery document
-_discovery_cache: Optional[Dict] = None
+# Cache for OpenID Connect discovery documents: url -> (fetched_at monotonic, document)
+_discovery_cache: Dict[str, Tuple[float, Dict]] = {}
+_discovery_lock = asyncio.Lock()
+
+
+def _cached_discovery(url: str) -> Optional[Dict]:
+    entry = _discovery_cache.get(url)
+    if entry and time.monotonic() - entry[0] < settings.OAUTH_DISCOVERY_CACHE_TTL:
+        return entry[1]
+    return None
 
 
 async def get_discovery_document() -> Dict:
     """
-    Fetch OpenID Connect discovery document and cache it.
+    Fetch OpenID Connect discovery document and cache it for OAUTH_DISCOVERY_CACHE_TTL seconds.
     Returns the discovery document with endpoints (authorization_endpoint, token_endpoint, userinfo_endpoint).
     """
-    global _discovery_cache
-    
-    if _discovery_cache is not None:
-        return _discovery_cache
-    
     if not settings.OAUTH_DISCOVERY_URL:
         raise ValueError(
             "OAuth configuration is missing. Please set OAUTH_DISCOVERY_URL environment variable. "
             "Example: https://login.microsoftonline.com/{tenant-id}/.well-known/openid-configuration"
         )
     
-    async with httpx.AsyncClient() as client:
-        try:
-            response = await client.get(settings.OAUTH_DISCOVERY_URL, timeout=10.0)
-            response.raise_for_status()
-            _discovery_cache = response.json()
-            logger.info(f"Fetched OpenID Connect discovery document from {settings.OAUTH_DISCOVERY_URL}")
-            return _discovery_cache
-        except httpx.HTTPError as e:
-            logger.error(f"Failed to fetch OpenID Connect discovery document: {e}")
-            raise ValueError(
-                f"Failed to fetch OpenID Connect discovery document from {settings.OAUTH_DISCOVERY_URL}. "
-                f"Error: {str(e)}"
-            )
+    url = settings.OAUTH_DISCOVERY_URL
+    document = _cached_discovery(url)
+    if document is not None:
+        return document
+    
+    # Only one coroutine refreshes an expired entry; the rest reuse its result
+    async with _discovery_lock:
+        document = _cached_discovery(url)
+        if document is not None:
+            return document
+        async with httpx.AsyncClient() as client:
+            try:
+                response = await client.get(url, timeout=10.0)
+                response.raise_for_status()
+                document = response.json()
+            except httpx.HTTPError as e:
+                logger.error(f"Failed to fetch OpenID Connect discovery document: {e}")
+                stale = _discovery_cache.get(url)
+                if stale:
+                    logger.warning("Using stale OpenID Connect discovery document")
+                    return stale[1]
+                raise ValueError(
+                    f"Failed to fetch OpenID Connect discovery document from {url}. "
+                    f"Error: {str(e)}"
+                )
+        _discovery_cache[url] = (time.monotonic(), document)
+        logger.info(f"Fetched OpenID Connect discovery document from {url}")
+        return document
+
+
+# Signed OAuth state: base64url(payload).base64url(hmac_sha256(key, payload)),
+# payload = {"n": nonce, "r": redirect_uri, "e": expiry}. No server-side storage needed.
+OAUTH_STATE_TTL_SECONDS = 900
+
+# Nonces of states already used in a callback on this worker -> their expiry.
+# Entries drop out once the state would have expired anyway (TTL semantics, no janitor).
+_consumed_state_nonces: Dict[str, int] = {}
+
+
+def _consume_state_nonce(nonce: str, expires_at: int) -> bool:
+    """Record a nonce as used; return False if it was already used (replay)"""
+    now = int(time.time())
+    for stale in [n for n, exp in _consumed_state_nonces.items() if exp < now]:
+        del _consumed_state_nonces[stale]
+    if nonce in _consumed_state_nonces:
+        return False
+    _consumed_state_nonces[nonce] = expires_at
+    return True
+
+
+def _b64encode(data: bytes) -> str:
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode("ascii")
+
+
+def _b64decode(data: str) -> bytes:
+    return base64.urlsafe_b64decode(data + "=" * (-len(data) % 4))
+
+
+def _state_signing_key() -> bytes:
+    """Derive the state key from JWT_SECRET_KEY so it is never used directly for two purposes"""
+    if not settings.JWT_SECRET_KEY:
+        raise ValueError("JWT_SECRET_KEY is not set. Please set the JWT_SECRET_KEY environment variable.")
+    return hmac.new(settings.JWT_SECRET_KEY.encode("utf-8"), b"oauth-state", hashlib.sha256).digest()
+
+
+def create_oauth_state(redirect_uri: Optional[str] = None) -> str:
+    """Create a signed, self-contained OAuth state carrying the post-login redirect URI"""
+    payload = json.dumps(
+        {
+            "n": secrets.token_urlsafe(16),
+            "r": redirect_uri,
+            "e": int(time.time()) + OAUTH_STATE_TTL_SECONDS,
+        },
+        separators=(",", ":"),
+    ).encode("utf-8")
+    signature = hmac.new(_state_signing_key(), payload, hashlib.sha256).digest()
+    return f"{_b64encode(payload)}.{_b64encode(signature)}"
+
+
+def verify_oauth_state(state: str) -> Optional[str]:
+    """
+    Verify a state created by create_oauth_state and return its redirect URI (may be None).
+    Each state is accepted once per worker.
+    Raises ValueError if the state is malformed, tampered with, expired or replayed.
+    """
+    try:
+        encoded_payload, encoded_signature = state.split(".", 1)
+        payload = _b64decode(encoded_payload)
+        signature = _b64decode(encoded_signature)
+    except ValueError:
+        raise ValueError("Malformed state parameter")
+    expected = hmac.new(_state_signing_key(), payload, hashlib.sha256).digest()
+    if not hmac.compare_digest(signature, expected):
+        raise ValueError("State signature mismatch")
+    try:
+        data = json.loads(payload)
+        nonce = str(data["n"])
+        expires_at = int(data["e"])
+    except (ValueError, KeyError, TypeError):
+        raise ValueError("Malformed state parameter")
+    if time.time() > expires_at:
+        raise ValueError("State has expired")
+    if not _consume_state_nonce(nonce, expires_at):
+        raise ValueError("State has already been used")
+    return data.get("r")
 
 
 async def get_oauth_authorization_url(state: str) -> str:
@@ -3,7 +3,9 @@ Security utilities for JWT tokens and password hashing
 """
 from datetime import datetime, timedelta
 from typing import Optional
-from jose import JWTError, jwt
+import asyncio
+import functools
+from jose import JWTError, jwt, jwk
 from passlib.context import CryptContext
 from app.core.config import settings
 from typing import Optional
@@ -27,6 +29,12 @@ def get_password_hash(password: str) -> str:
     return pwd_context.hash(password)
 
 
+@functools.lru_cache(maxsize=4)
+def _signing_key(secret: str, algorithm: str):
+    """Construct the JWK used for signing once per (secret, algorithm) instead of per token"""
+    return jwk.construct(secret, algorithm)
+
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     """Create a JWT access token"""
     if not settings.JWT_SECRET_KEY:
@@ -41,11 +49,24 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
         )
     to_encode.update({"exp": expire})
     encoded_jwt = jwt.encode(
-        to_encode, settings.JWT_SECRET_KEY, algorithm=settings.JWT_ALGORITHM
+        to_encode,
+        _signing_key(settings.JWT_SECRET_KEY, settings.JWT_ALGORITHM),
+        algorithm=settings.JWT_ALGORITHM,
     )
     return encoded_jwt
 
 
+async def create_access_token_async(data: dict, expires_delta: Optional[timedelta] = None) -> str:
+    """
+    Create a JWT access token from async code.
+    HMAC (HS*) signing takes microseconds and runs inline; RSA/EC signing is
+    offloaded to a worker thread so it doesn't stall the event loop.
+    """
+    if settings.JWT_ALGORITHM.upper().startswith("HS"):
+        return create_access_token(data, expires_delta)
+    return await asyncio.to_thread(create_access_token, data, expires_delta)
+
+
 def decode_access_token(token: str) -> Optional[dict]:
     """Decode and verify a JWT token"""
     if not settings.JWT_SECRET_KEY:
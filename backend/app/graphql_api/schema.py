@@ -32,7 +32,7 @@ from app.graphql_api.resolvers import (
     resolve_users, resolve_projects, resolve_environments, resolve_services,
     model_to_user, model_to_project, model_to_environment, model_to_service,
 )
-from app.core.dependencies import check_permission, check_resource_permission, can_grant_resource_permission
+from app.core.dependencies import check_permission, check_resource_permission, check_resource_actions, can_grant_resource_permission
 from app.models.permission import ResourcePermission as ResourcePermissionModel, PermissionScope
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, exists, and_, text
@@ -51,11 +51,12 @@ from datetime import datetime
 import json
 import hashlib
 import os
+import uuid
 from dbos import DBOSClient
 from app.workflows.dbos_deploy import create_dbos_client
 from app.core.config import settings
 from app.core.security import encrypt_secret, decrypt_secret
-from app.core.k8s.health import check_readyz
+from app.core.k8s.health import check_readyz, check_readyz_many
 from app.core.k8s.connection import check_connection
 @strawberry.type
 class PublishVersionResult:
@@ -94,20 +95,6 @@ class OverallChangeStatus:
     variables: bool
     secrets: bool
 
-try:
-    import kubernetes
-    from kubernetes.client import Configuration as K8sConfiguration, ApiClient as K8sApiClient
-    from kubernetes.client.rest import ApiException as K8sApiException
-    from kubernetes.client import AuthenticationApi as K8sAuthenticationApi
-    from kubernetes import config as k8s_config
-except Exception:
-    kubernetes = None  # type: ignore
-    K8sConfiguration = None  # type: ignore
-    K8sApiClient = None  # type: ignore
-    K8sApiException = Exception  # type: ignore
-    K8sAuthenticationApi = None  # type: ignore
-    k8s_config = None  # type: ignore
-
 
 @strawberry.type
 class Query:
@@ -144,8 +131,10 @@ class Query:
             raise Exception("Access denied")
         results = await db.execute(select(KubernetesClusterModel).order_by(KubernetesClusterModel.created_at.desc()))
         items = results.scalars().all()
+        # Probe every cluster's unauthenticated /readyz concurrently
+        readyz = await check_readyz_many([i.api_url or "" for i in items], timeout_seconds=3.0, verify_ssl=False)
         out: List[GqlKubernetesCluster] = []
-        for i in items:
+        for i, (ok, msg) in zip(items, readyz):
             cluster = GqlKubernetesCluster(
                     id=i.id,
                     name=i.name,
@@ -156,8 +145,6 @@ class Query:
                     created_at=i.created_at,
                     updated_at=i.updated_at,
                 )
-            # Compute unauthenticated /readyz using shared helper
-            ok, msg = await check_readyz(i.api_url or "", timeout_seconds=3.0, verify_ssl=False)
             cluster.api_health = ConnectionTestResult(ok=ok, message=msg)
             # Compute authenticated connection (best-effort) via shared helper
             try:
@@ -430,6 +417,11 @@ class Query:
         current_user = context.current_user
         if not current_user:
             raise Exception("Authentication required")
+        try:
+            uuid.UUID(id)
+        except ValueError:
+            # deployments.id is a native uuid column; a malformed id cannot match any row
+            return None
         res = await db.execute(select(DeploymentModel).where(DeploymentModel.id == id))
         d = res.scalar_one_or_none()
         if not d:
@@ -1190,16 +1182,17 @@ class Query:
         is_admin = current_user.get('is_admin', False)
         is_owner = project.owner_id == current_user.get('id')
         
-        # Check permissions using the existing check_resource_permission function
-        can_read = await check_resource_permission(
-            current_user, PermissionAction.READ, PermissionScope.PROJECT, id, db
-        )
-        can_write = await check_resource_permission(
-            current_user, PermissionAction.WRITE, PermissionScope.PROJECT, id, db
-        )
-        can_delete = await check_resource_permission(
-            current_user, PermissionAction.DELETE, PermissionScope.PROJECT, id, db
+        # Check read/write/delete in one query
+        allowed = await check_resource_actions(
+            current_user,
+            [PermissionAction.READ, PermissionAction.WRITE, PermissionAction.DELETE],
+            PermissionScope.PROJECT,
+            id,
+            db,
         )
+        can_read = allowed[PermissionAction.READ]
+        can_write = allowed[PermissionAction.WRITE]
+        can_delete = allowed[PermissionAction.DELETE]
         
         permissions_obj = ComputedUserPermission(
             can_read=can_read,
@@ -1220,9 +1213,7 @@ class Query:
         env_vars = env_vars_result.scalars().all()
         
         # Check read permission for env vars
-        has_env_var_access = await check_resource_permission(
-            current_user, PermissionAction.READ, PermissionScope.PROJECT, id, db
-        )
+        has_env_var_access = can_read
         
         env_vars_list = []
         if has_env_var_access:
@@ -1250,9 +1241,7 @@ class Query:
         secrets = secrets_result.scalars().all()
         
         # Check read permission for secrets
-        has_secret_access = await check_resource_permission(
-            current_user, PermissionAction.READ, PermissionScope.PROJECT, id, db
-        )
+        has_secret_access = can_read
         
         secrets_list = []
         if has_secret_access:
@@ -1390,16 +1379,17 @@ class Query:
         project = project_result.scalar_one_or_none()
         is_owner = project and project.owner_id == current_user.get('id')
         
-        # Check permissions using the existing check_resource_permission function
-        can_read = await check_resource_permission(
-            current_user, PermissionAction.READ, PermissionScope.ENVIRONMENT, id, db
-        )
-        can_write = await check_resource_permission(
-            current_user, PermissionAction.WRITE, PermissionScope.ENVIRONMENT, id, db
-        )
-        can_delete = await check_resource_permission(
-            current_user, PermissionAction.DELETE, PermissionScope.ENVIRONMENT, id, db
+        # Check read/write/delete in one query
+        allowed = await check_resource_actions(
+            current_user,
+            [PermissionAction.READ, PermissionAction.WRITE, PermissionAction.DELETE],
+            PermissionScope.ENVIRONMENT,
+            id,
+            db,
         )
+        can_read = allowed[PermissionAction.READ]
+        can_write = allowed[PermissionAction.WRITE]
+        can_delete = allowed[PermissionAction.DELETE]
         
         permissions_obj = ComputedUserPermission(
             can_read=can_read,
@@ -1420,9 +1410,7 @@ class Query:
         env_vars = env_vars_result.scalars().all()
         
         # Check read permission for env vars
-        has_env_var_access = await check_resource_permission(
-            current_user, PermissionAction.READ, PermissionScope.ENVIRONMENT, id, db
-        )
+        has_env_var_access = can_read
         
         env_vars_list = []
         if has_env_var_access:
@@ -1450,9 +1438,7 @@ class Query:
         secrets = secrets_result.scalars().all()
         
         # Check read permission for secrets
-        has_secret_access = await check_resource_permission(
-            current_user, PermissionAction.READ, PermissionScope.ENVIRONMENT, id, db
-        )
+        has_secret_access = can_read
         
         secrets_list = []
         if has_secret_access:
@@ -1546,16 +1532,17 @@ class Query:
         project = project_result.scalar_one_or_none()
         is_owner = project and project.owner_id == current_user.get('id')
         
-        # Check permissions using the existing check_resource_permission function
-        can_read = await check_resource_permission(
-            current_user, PermissionAction.READ, PermissionScope.SERVICE, id, db
-        )
-        can_write = await check_resource_permission(
-            current_user, PermissionAction.WRITE, PermissionScope.SERVICE, id, db
-        )
-        can_delete = await check_resource_permission(
-            current_user, PermissionAction.DELETE, PermissionScope.SERVICE, id, db
+        # Check read/write/delete in one query
+        allowed = await check_resource_actions(
+            current_user,
+            [PermissionAction.READ, PermissionAction.WRITE, PermissionAction.DELETE],
+            PermissionScope.SERVICE,
+            id,
+            db,
         )
+        can_read = allowed[PermissionAction.READ]
+        can_write = allowed[PermissionAction.WRITE]
+        can_delete = allowed[PermissionAction.DELETE]
         
         permissions_obj = ComputedUserPermission(
             can_read=can_read,
@@ -1576,9 +1563,7 @@ class Query:
         env_vars = env_vars_result.scalars().all()
         
         # Check read permission for env vars
-        has_env_var_access = await check_resource_permission(
-            current_user, PermissionAction.READ, PermissionScope.SERVICE, id, db
-        )
+        has_env_var_access = can_read
         
         env_vars_list = []
         if has_env_var_access:
@@ -1606,9 +1591,7 @@ class Query:
         secrets = secrets_result.scalars().all()
         
         # Check read permission for secrets
-        has_secret_access = await check_resource_permission(
-            current_user, PermissionAction.READ, PermissionScope.SERVICE, id, db
-        )
+        has_secret_access = can_read
         
         secrets_list = []
         if has_secret_access:
@@ -1635,9 +1618,7 @@ class Query:
         service_configs = service_configs_result.scalars().all()
         
         # Check read permission for service configs (same as service read permission)
-        has_config_access = await check_resource_permission(
-            current_user, PermissionAction.READ, PermissionScope.SERVICE, id, db
-        )
+        has_config_access = can_read
         
         service_configs_list = []
         if has_config_access:
@@ -2226,111 +2207,77 @@ async def check_scope_write_permission(
     db: AsyncSession,
 ) -> bool:
     """Optimized permission check for variable/secret scope"""
+    # Column-only selects: only owner_id / project_id / actions are read, so no ORM
+    # instances are hydrated or added to the identity map
     user_id = current_user.get('id')
     is_admin = current_user.get('is_admin', False)
     
-    if scope == VariableScope.PROJECT:
-        project_result = await db.execute(
-            select(ProjectModel).where(ProjectModel.id == resource_id, ProjectModel.deleted_at.is_(None))
+    async def has_write_grant(grant_scope: PermissionScope, grant_resource_id: str) -> bool:
+        actions = await db.scalar(
+            select(ResourcePermissionModel.actions).where(
+                ResourcePermissionModel.user_id == user_id,
+                ResourcePermissionModel.scope == grant_scope.value,
+                ResourcePermissionModel.resource_id == grant_resource_id,
+            )
         )
-        project = project_result.scalar_one_or_none()
+        return bool(actions) and 'write' in actions
+    
+    if scope == VariableScope.PROJECT:
+        project = (await db.execute(
+            select(ProjectModel.owner_id).where(ProjectModel.id == resource_id, ProjectModel.deleted_at.is_(None))
+        )).first()
         if not project:
             return False
         
         if is_admin or project.owner_id == user_id:
             return True
         
-        perm_result = await db.execute(
-            select(ResourcePermissionModel).where(
-                ResourcePermissionModel.user_id == user_id,
-                ResourcePermissionModel.scope == PermissionScope.PROJECT.value,
-                ResourcePermissionModel.resource_id == resource_id,
-            )
-        )
-        resource_perm = perm_result.scalar_one_or_none()
-        return resource_perm and resource_perm.actions and 'write' in resource_perm.actions
+        return await has_write_grant(PermissionScope.PROJECT, resource_id)
     
     elif scope == VariableScope.ENVIRONMENT:
-        env_result = await db.execute(
-            select(EnvironmentModel).where(EnvironmentModel.id == resource_id, EnvironmentModel.deleted_at.is_(None))
-        )
-        env = env_result.scalar_one_or_none()
+        env = (await db.execute(
+            select(EnvironmentModel.project_id, ProjectModel.id.label("live_project_id"), ProjectModel.owner_id)
+            .outerjoin(
+                ProjectModel,
+                and_(ProjectModel.id == EnvironmentModel.project_id, ProjectModel.deleted_at.is_(None)),
+            )
+            .where(EnvironmentModel.id == resource_id, EnvironmentModel.deleted_at.is_(None))
+        )).first()
         if not env:
             return False
         
-        project_result = await db.execute(
-            select(ProjectModel).where(ProjectModel.id == env.project_id, ProjectModel.deleted_at.is_(None))
-        )
-        project = project_result.scalar_one_or_none()
-        
-        if is_admin or (project and project.owner_id == user_id):
+        if is_admin or (env.owner_id is not None and env.owner_id == user_id):
             return True
         
         # Check direct environment permission
-        perm_result = await db.execute(
-            select(ResourcePermissionModel).where(
-                ResourcePermissionModel.user_id == user_id,
-                ResourcePermissionModel.scope == PermissionScope.ENVIRONMENT.value,
-                ResourcePermissionModel.resource_id == resource_id,
-            )
-        )
-        env_perm = perm_result.scalar_one_or_none()
-        if env_perm and env_perm.actions and 'write' in env_perm.actions:
+        if await has_write_grant(PermissionScope.ENVIRONMENT, resource_id):
             return True
         
         # Check project-level permission inheritance
-        if project:
-            proj_perm_result = await db.execute(
-                select(ResourcePermissionModel).where(
-                    ResourcePermissionModel.user_id == user_id,
-                    ResourcePermissionModel.scope == PermissionScope.PROJECT.value,
-                    ResourcePermissionModel.resource_id == env.project_id,
-                )
-            )
-            proj_perm = proj_perm_result.scalar_one_or_none()
-            if proj_perm and proj_perm.actions and 'write' in proj_perm.actions:
-                return True
-        
-        return False
+        if env.live_project_id is None:
+            return False
+        return await has_write_grant(PermissionScope.PROJECT, env.project_id)
     
     elif scope == VariableScope.SERVICE:
-        service_result = await db.execute(
-            select(ServiceModel).options(selectinload(ServiceModel.project))
+        service = (await db.execute(
+            select(ServiceModel.project_id, ProjectModel.id.label("live_project_id"), ProjectModel.owner_id)
+            .outerjoin(ProjectModel, ProjectModel.id == ServiceModel.project_id)
             .where(ServiceModel.id == resource_id, ServiceModel.deleted_at.is_(None))
-        )
-        service = service_result.scalar_one_or_none()
+        )).first()
         if not service:
             return False
         
-        if is_admin or (service.project and service.project.owner_id == user_id):
+        if is_admin or (service.owner_id is not None and service.owner_id == user_id):
             return True
         
         # Check direct service permission
-        perm_result = await db.execute(
-            select(ResourcePermissionModel).where(
-                ResourcePermissionModel.user_id == user_id,
-                ResourcePermissionModel.scope == PermissionScope.SERVICE.value,
-                ResourcePermissionModel.resource_id == resource_id,
-            )
-        )
-        service_perm = perm_result.scalar_one_or_none()
-        if service_perm and service_perm.actions and 'write' in service_perm.actions:
+        if await has_write_grant(PermissionScope.SERVICE, resource_id):
             return True
         
         # Check project-level permission inheritance
-        if service.project:
-            proj_perm_result = await db.execute(
-                select(ResourcePermissionModel).where(
-                    ResourcePermissionModel.user_id == user_id,
-                    ResourcePermissionModel.scope == PermissionScope.PROJECT.value,
-                    ResourcePermissionModel.resource_id == service.project_id,
-                )
-            )
-            proj_perm = proj_perm_result.scalar_one_or_none()
-            if proj_perm and proj_perm.actions and 'write' in proj_perm.actions:
-                return True
-        
-        return False
+        if service.live_project_id is None:
+            return False
+        return await has_write_grant(PermissionScope.PROJECT, service.project_id)
     
     return False
 
@@ -7,6 +7,7 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from app.core.config import settings
 from app.core.database import init_db, close_db
+from app.core.k8s.health import close_readyz_clients
 from app.core.middleware import OpenIDAuthMiddleware
 from app.api.v1.router import api_router
 from starlette.middleware.base import BaseHTTPMiddleware
@@ -57,6 +58,7 @@ async def lifespan(app: FastAPI):
     yield
     # Shutdown - close database connections
     logger.info("Shutting down application...")
+    await close_readyz_clients()
     await close_db()
     logger.info("Application shut down successfully")
 
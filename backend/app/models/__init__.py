@@ -7,7 +7,6 @@ from app.models.environment import Environment
 from app.models.service import Service
 from app.models.config import ProjectConfig, EnvironmentConfig, ServiceConfig, AdminConfig
 from app.models.permission import Permission, UserPermission, ResourcePermission, PermissionScope
-from app.models.oauth_state import OAuthState
 from app.models.variable import EnvironmentVariable, Secret, VariableScope
 
 __all__ = [
@@ -23,7 +22,6 @@ __all__ = [
     "UserPermission",
     "ResourcePermission",
     "PermissionScope",
-    "OAuthState",
     "EnvironmentVariable",
     "Secret",
     "VariableScope",
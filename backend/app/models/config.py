@@ -4,6 +4,7 @@ Configuration models for projects, environments, and services
 from typing import Optional, Dict, Any
 from datetime import datetime
 from sqlalchemy import Column, String, Text, JSON, DateTime, ForeignKey, UniqueConstraint
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import relationship, Mapped, mapped_column
 from sqlalchemy.sql import func
 from app.core.database import Base
@@ -97,7 +98,7 @@ class AdminConfig(Base):
     id: Mapped[str] = mapped_column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
     key: Mapped[str] = mapped_column(String, nullable=False, unique=True, index=True)
     value: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
-    config_data: Mapped[Optional[Dict[str, Any]]] = mapped_column(JSON, nullable=True)
+    config_data: Mapped[Optional[Dict[str, Any]]] = mapped_column(JSON().with_variant(JSONB(), "postgresql"), nullable=True)
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
     updated_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), onupdate=func.now(), nullable=True)
     
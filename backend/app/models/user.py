@@ -14,6 +14,9 @@ class User(Base):
     """User model for authentication and authorization"""
     
     __tablename__ = "users"
+    # Fetch server-generated created_at/updated_at via RETURNING on INSERT/UPDATE,
+    # so callers don't need a refresh() round-trip after commit
+    __mapper_args__ = {"eager_defaults": True}
     
     id: Mapped[str] = mapped_column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
     email: Mapped[str] = mapped_column(String, unique=True, index=True, nullable=False)
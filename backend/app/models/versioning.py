@@ -3,7 +3,8 @@ Models for service versions and deployments
 """
 from typing import Optional, Dict, Any, List
 from datetime import datetime
-from sqlalchemy import String, DateTime, ForeignKey, UniqueConstraint, Enum, JSON
+from sqlalchemy import String, DateTime, ForeignKey, UniqueConstraint, Enum, JSON, Uuid
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import relationship, Mapped, mapped_column
 from sqlalchemy.sql import func
 from app.core.database import Base
@@ -41,13 +42,14 @@ class Deployment(Base):
 
     __tablename__ = "deployments"
 
-    id: Mapped[str] = mapped_column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
+    # Native uuid column on PostgreSQL; values are still exposed as strings
+    id: Mapped[str] = mapped_column(Uuid(as_uuid=False), primary_key=True, default=lambda: str(uuid.uuid4()))
     service_id: Mapped[str] = mapped_column(String, ForeignKey("services.id", ondelete="CASCADE"), nullable=False, index=True)
     version_id: Mapped[str] = mapped_column(String, ForeignKey("service_versions.id", ondelete="CASCADE"), nullable=False, index=True)
     environment_id: Mapped[Optional[str]] = mapped_column(String, ForeignKey("environments.id", ondelete="SET NULL"), nullable=True, index=True)
     workflow_uuid: Mapped[Optional[str]] = mapped_column(String, nullable=True, index=True)
-    steps: Mapped[Optional[list]] = mapped_column(JSON, nullable=True)  # ordered list of workflow step dicts
-    downstream_overrides: Mapped[Optional[list]] = mapped_column(JSON, nullable=True)  # [{serviceName, serviceId, version}]
+    steps: Mapped[Optional[list]] = mapped_column(JSON().with_variant(JSONB(), "postgresql"), nullable=True)  # ordered list of workflow step dicts
+    downstream_overrides: Mapped[Optional[list]] = mapped_column(JSON().with_variant(JSONB(), "postgresql"), nullable=True)  # [{serviceName, serviceId, version}]
     status: Mapped[DeploymentStatus] = mapped_column(Enum(DeploymentStatus), default=DeploymentStatus.PENDING, index=True)
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
     completed_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)